@@ -0,0 +1,89 @@
+"""Compare the shared single-pass parser with the per-script regex loops
+
+Run from the repository root:  python benchmarks/bench_parser.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wifimon.parser import parse_networks, strongest_by_ssid
+from wifimon.synth import NetshGenerator
+
+
+def make_output(n_bssids, per_ssid=3, lang='en'):
+    """Build a `netsh wlan show networks mode=bssid` text with n_bssids BSSIDs"""
+    return NetshGenerator(n_bssids, per_ssid=per_ssid, hidden=0, lang=lang).networks_text()
+
+# ----------------- Previous implementations -----------------
+
+
+def legacy_test_py(out):
+    """Parsing loop formerly in test.py's scan_available_wifis()"""
+    networks = {}
+    current_ssid = None
+    for line in out.split('\n'):
+        line = line.strip()
+        for pattern in [r'SSID\s*\d+\s*:\s*(.+)', r'SSID\s*:\s*(.+)', r'Profile\s*:\s*(.+)']:
+            ssid_match = re.match(pattern, line, re.IGNORECASE)
+            if ssid_match:
+                current_ssid = ssid_match.group(1).strip()
+                if current_ssid and current_ssid not in networks:
+                    networks[current_ssid] = []
+                break
+        for pattern in [r'Signal\s*:\s*(\d+)%', r'Signal\s*Quality\s*:\s*(\d+)', r'Strength\s*:\s*(\d+)']:
+            signal_match = re.search(pattern, line, re.IGNORECASE)
+            if signal_match:
+                if current_ssid:
+                    networks[current_ssid].append(int(signal_match.group(1)))
+                break
+    return {ssid: max(s) if s else 0 for ssid, s in networks.items()}
+
+
+def legacy_ex3_py(out):
+    """Parsing loop formerly in ex3.py's scan_available_wifis()"""
+    networks = {}
+    current_ssid = None
+    for line in out.split('\n'):
+        line = line.strip()
+        ssid_match = re.match(r'(?:SSID\s*\d*\s*|Profile\s*):\s*(.+)', line)
+        if ssid_match:
+            current_ssid = ssid_match.group(1).strip()
+            if current_ssid and current_ssid not in networks:
+                networks[current_ssid] = []
+            continue
+        signal_match = re.search(r'Signal\s*:\s*(\d+)%', line)
+        if signal_match and current_ssid:
+            networks[current_ssid].append(int(signal_match.group(1)))
+    return {ssid: max(s) if s else 0 for ssid, s in networks.items()}
+
+
+def shared_parser(out):
+    return strongest_by_ssid(parse_networks(out))
+
+
+def best_of(func, arg, repeat=5):
+    """Best per-call time in milliseconds"""
+    number = max(1, 2000 // max(1, arg.count('\n')))
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=repeat)) / number * 1000
+
+
+if __name__ == '__main__':
+    print(f"{'BSSIDs':>7} {'test.py':>10} {'ex3.py':>10} {'shared':>10} {'vs test.py':>11}")
+    for n in (10, 100, 300, 1000, 5000):
+        out = make_output(n)
+        assert shared_parser(out) == legacy_test_py(out)
+        t_test = best_of(legacy_test_py, out)
+        t_ex3 = best_of(legacy_ex3_py, out)
+        t_new = best_of(shared_parser, out)
+        print(f"{n:>7} {t_test:>8.2f}ms {t_ex3:>8.2f}ms {t_new:>8.2f}ms {t_test / t_new:>10.1f}x")
+
+    # The old loops only knew English labels; the shared parser on French output
+    print(f"\n{'BSSIDs':>7} {'shared en':>10} {'shared fr':>10}")
+    for n in (10, 100, 1000, 5000):
+        en, fr = make_output(n), make_output(n, lang='fr')
+        assert shared_parser(fr) == shared_parser(en)
+        print(f"{n:>7} {best_of(shared_parser, en):>8.2f}ms {best_of(shared_parser, fr):>8.2f}ms")
@@ -0,0 +1,248 @@
+"""Per-stage timings of the scan -> plot pipeline, checked against a stored baseline
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py [--output results.json]
+    python benchmarks/bench_pipeline.py --save-baseline      # after an intended change
+
+Stages, over synthetic netsh outputs of increasing size (wifimon.synth):
+decode (bytes -> text), parse (tp2.3.py's read_networks_from_cmd, and the
+shared parser used by test.py / ex3.py), store (SeriesStore), stats
+(SlidingStats) and render (one animation tick of each frontend, draws
+included, on an Agg canvas through wifimon.replay). Exits with status 1
+when a stage is slower than `threshold` times its baseline, after scaling
+the baseline by a calibration workload timed on both machines.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+import timeit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from wifimon.parser import parse_networks, strongest_by_ssid
+from wifimon.replay import ReplaySource, load_function, replay_subprocess, run_frontend
+from wifimon.scan import console_codec, decode_output
+from wifimon.stats import SlidingStats
+from wifimon.store import SeriesStore
+from wifimon.synth import NetshGenerator
+
+BASELINE = os.path.join(REPO_DIR, 'benchmarks', 'baseline.json')
+# Reruns of unchanged code on one (shared, single-CPU) machine differ by up to ~2x per stage
+# even after calibration, so only slowdowns past 3x are reported as regressions
+THRESHOLD = 3.0
+SIZES = (10, 100, 1000, 5000)
+RENDER_SIZES = (10, 100, 1000)
+FRONTENDS = {
+    'render_spectrum': 'tp2.3.py',
+    'render_gaussian': 'tp2.3(test).py',
+    'render_dual_dbm': 'ex3.py',
+    'render_dual_percent': 'test.py',
+}
+
+
+def best_of(func, repeat=7, min_time=0.05):
+    """Best per-call time in milliseconds"""
+    number = 1
+    while True:
+        t = timeit.timeit(func, number=number)
+        if t >= min_time or number >= 10000:
+            break
+        number *= 4
+    return min([t] + timeit.repeat(func, number=number, repeat=repeat - 1)) / number * 1000
+
+
+def calibrate(runs=9):
+    """Median time (ms) of a fixed workload, to scale a baseline taken on another machine
+
+    The workload looks like the stages (regex over netsh-like text, dict and
+    list building, float parsing, NumPy ring writes, ~10 ms) but uses no
+    wifimon code, so a regression cannot hide by slowing the calibration
+    too. The median of several runs keeps one noisy run from skewing the scale.
+    """
+    rng = random.Random(0)
+    text = '\n'.join(f"    BSSID {i:<18}: {rng.getrandbits(48):012x}\n"
+                     f"         Signal             : {rng.randint(1, 100)}%\n"
+                     f"         Channel            : {rng.choice((1, 6, 11, 36, 44))}"
+                     for i in range(2000))
+    line = re.compile(r'^\s*(\w+)[^:]*:\s*(.*)$', re.M)
+    ring = np.zeros(1024, dtype=np.float32)
+
+    def work():
+        fields = {}
+        for label, value in line.findall(text):
+            fields.setdefault(label, []).append(value)
+        signals = sorted(float(v.rstrip('%')) for v in fields['Signal'])
+        for i, signal in enumerate(signals):
+            ring[i % len(ring)] = signal
+        return float(ring.mean()), len(fields['BSSID'])
+
+    work()  # warm-up
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        work()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+# ----------------- Stages -----------------
+
+
+def bench_decode(text):
+    data = text.encode(console_codec(), errors='replace')
+    return best_of(lambda: decode_output(data))
+
+
+def bench_parse_tp23(text):
+    read_networks = load_function(os.path.join(REPO_DIR, 'tp2.3.py'), 'read_networks_from_cmd')
+    source = ReplaySource([(0.0, 'networks', text)])
+    with replay_subprocess(source):
+        return best_of(read_networks)
+
+
+def bench_parse_shared(text):
+    return best_of(lambda: strongest_by_ssid(parse_networks(text)))
+
+
+def bench_store(text):
+    """One sample appended per network (what update() does per scan)"""
+    networks = strongest_by_ssid(parse_networks(text))
+    store = SeriesStore(capacity=50)
+    clock = [0]
+
+    def append():
+        clock[0] += 5000
+        for ssid, signal in networks.items():
+            store.append(ssid, clock[0], signal)
+    return best_of(append)
+
+
+def bench_stats(text):
+    networks = strongest_by_ssid(parse_networks(text))
+    stats = {ssid: SlidingStats(window=100) for ssid in networks}
+
+    def push():
+        for ssid, signal in networks.items():
+            s = stats[ssid]
+            s.push(signal)
+            s.mean_std()
+    return best_of(push)
+
+
+def bench_render(script, n, frames=5):
+    """Median frame latency (update and draws) of a frontend fed n drifting BSSIDs"""
+    source = ReplaySource(NetshGenerator(n, seed=0).recording(steps=frames + 2))
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = run_frontend(os.path.join(REPO_DIR, script), source, frames=frames, pace=False)
+    plt.close('all')
+    return report.p50_ms
+
+
+def run_all(sizes=SIZES, render_sizes=RENDER_SIZES, render=True):
+    results = {}
+    texts = {n: NetshGenerator(n, seed=0).networks_text() for n in sizes}
+    for name, bench in (('decode', bench_decode), ('parse_tp2.3', bench_parse_tp23),
+                        ('parse_shared', bench_parse_shared), ('store', bench_store),
+                        ('stats', bench_stats)):
+        results[name] = {str(n): bench(texts[n]) for n in sizes}
+    if render:
+        for name, script in FRONTENDS.items():
+            results[name] = {str(n): bench_render(script, n) for n in render_sizes}
+    return results
+
+# ----------------- Baseline -----------------
+
+
+def compare(results, baseline, threshold, scale=1.0, min_ms=0.05):
+    """[(stage, size, ms, baseline ms)] of the stages slower than threshold x baseline
+
+    Baseline times are multiplied by `scale` (this machine's calibration
+    time over the baseline's) first. Entries whose baseline is under min_ms
+    are too close to the timer resolution to be compared.
+    """
+    regressions = []
+    for stage, sizes in results.items():
+        for size, ms in sizes.items():
+            base = baseline.get(stage, {}).get(size)
+            if base is not None and base >= min_ms and ms > base * scale * threshold:
+                regressions.append((stage, size, ms, base * scale))
+    return regressions
+
+
+def print_table(results, baseline, scale=1.0):
+    sizes = sorted({int(s) for stage in results.values() for s in stage})
+    print(f"{'stage':<20}" + ''.join(f"{n:>12}" for n in sizes))
+    for stage, values in results.items():
+        cells = []
+        for n in sizes:
+            ms = values.get(str(n))
+            base = baseline.get(stage, {}).get(str(n))
+            base = base * scale if base else None
+            cell = '' if ms is None else f"{ms:.3f}" + (f" {ms / base:.1f}x" if base else '')
+            cells.append(f"{cell:>12}")
+        print(f"{stage:<20}" + ''.join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', help='write the results (JSON) to this file')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='fail when a stage is slower than THRESHOLD x its baseline')
+    parser.add_argument('--no-render', action='store_true', help='skip the frontend render stages')
+    args = parser.parse_args(argv)
+
+    # Calibrated before and after the stages, so load changing mid-run shows in both
+    before = calibrate()
+    results = run_all(render=not args.no_render)
+    calibration = (before + calibrate()) / 2
+    doc = {
+        'calibration_ms': calibration,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'matplotlib': matplotlib.__version__,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'unit': 'ms',
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(doc, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(doc, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+
+    baseline, scale = {}, 1.0
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            stored = json.load(f)
+        baseline = stored['results']
+        scale = calibration / stored['calibration_ms']
+        print(f"machine speed vs baseline: {1 / scale:.2f}x")
+    print_table(results, baseline, scale)
+
+    regressions = compare(results, baseline, args.threshold, scale)
+    for stage, size, ms, base in regressions:
+        print(f"REGRESSION {stage} @ {size} BSSIDs: {ms:.3f} ms vs baseline {base:.3f} ms")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
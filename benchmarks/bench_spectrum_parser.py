@@ -0,0 +1,70 @@
+"""Linear-time report for tp2.3.py's extract_networks()
+
+Run from the repository root:  python benchmarks/bench_spectrum_parser.py [--legacy]
+
+Times the extractor on real-looking netsh output and on each malformed
+input of wifimon.synth.ADVERSARIAL, at 1000 and 16000 repeats, and exits
+with status 1 when the time grows more than 3x faster than the input. The
+correctness fuzzing is in tests/test_spectrum_parser.py.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from wifimon.replay import load_function
+from wifimon.synth import ADVERSARIAL, NetshGenerator
+
+extract_networks = load_function(os.path.join(REPO_DIR, 'tp2.3.py'), 'extract_networks')
+
+SIZES = (1000, 16000)
+
+# The pattern tp2.3.py used before, kept to show the difference on tiny inputs
+LEGACY_PATTERN = re.compile(
+    r"(?:SSID\s*\d*\s*:\s*|Nom du réseau\s*:\s*)(.*?)\s*(?:.*?\n){0,6}.*?"
+    r"(?:Signal\s*:\s*|Strength\s*:\s*)(\d+)%.*?(?:Canal\s*:\s*|Channel\s*:\s*)(\d+)",
+    re.DOTALL | re.IGNORECASE)
+
+INPUTS = dict(ADVERSARIAL, netsh_output=lambda n: NetshGenerator(n // 4, seed=0).networks_text())
+
+
+def best_time(text, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        extract_networks(text)
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--legacy', action='store_true',
+                        help='also time the old regex on a 6-block input (takes ~0.3 s)')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    growth = SIZES[-1] / SIZES[0]
+    for name, make in INPUTS.items():
+        small, large = (best_time(make(n)) for n in SIZES)
+        ratio = large / max(small, 1e-6)
+        slow = ratio > growth * 3
+        failures += slow
+        print(f"{name:<24} {small * 1000:8.2f} ms -> {large * 1000:8.2f} ms "
+              f"({growth:.0f}x input, {ratio:.1f}x time){'  NOT LINEAR' if slow else ''}")
+
+    if args.legacy:
+        text = ADVERSARIAL['ssid_signal_no_percent'](6)
+        t = time.perf_counter()
+        LEGACY_PATTERN.findall(text)
+        print(f"old regex on {len(text)} bytes: {(time.perf_counter() - t) * 1000:.0f} ms")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Startup time of the headless collector vs. a plotting frontend
+
+Run from the repository root:  python benchmarks/bench_startup.py [budget_seconds]
+Exits with status 1 when `collect` misses the budget or imports matplotlib/numpy.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_wall_time(args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=REPO_DIR, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+if __name__ == '__main__':
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+
+    leaked = subprocess.run(
+        [sys.executable, '-c',
+         "import sys; from wifimon.cli import main; main(['collect', '--count', '1', '--interval', '0']);"
+         "print('loaded:' + ','.join(m for m in ('matplotlib', 'numpy', 'scipy') if m in sys.modules))"],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.rsplit('loaded:', 1)[1].strip()
+
+    t_collect = best_wall_time(['-m', 'wifimon', 'collect', '--count', '1', '--interval', '0'])
+    t_gui = best_wall_time(['-c', 'import numpy, matplotlib.pyplot, matplotlib.animation'])
+
+    print(f"collect (whole process): {t_collect * 1000:8.1f} ms  (budget {budget * 1000:.0f} ms)")
+    print(f"plotting imports only:   {t_gui * 1000:8.1f} ms")
+    print(f"heavy modules loaded by collect: {leaked or 'none'}")
+    sys.exit(1 if leaked or t_collect > budget else 0)
@@ -1,105 +1,85 @@
 import subprocess
-import re
+import functools
 from datetime import datetime
-from matplotlib.animation import FuncAnimation
 from matplotlib import pyplot as plt
-import collections
+from wifimon.parser import parse_networks, parse_interfaces, strongest_by_ssid, connected_wifi
+from wifimon.sampler import Sampler
+from wifimon.store import SeriesStore, NETWORK_TTL, MAX_NETWORKS
+from wifimon.rollup import Rollup
+from wifimon.topk import TopK, TOP_NETWORKS
+from wifimon.render import Blitter, SignalPanel
+from wifimon.scan import SCAN_COMMANDS, CommandChain, decode_output
+from wifimon.timing import profiler
 
 # ----------------- WiFi Scanning Functions -----------------
 
-def scan_available_wifis():
-    """Scan for all available WiFi networks using multiple methods"""
+def run_scan_command(cmd):
+    """Strongest signal per SSID from one netsh command, % converted to dBm (empty when it fails)"""
     try:
-        commands = [
-            "netsh wlan show networks mode=bssid",
-            "netsh wlan show networks",
-            "netsh wlan show all"
-        ]
-
-        for cmd in commands:
+        with profiler.stage('scan.subprocess'):
+            p = subprocess.Popen(cmd,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 shell=True)
             try:
-                p = subprocess.Popen(cmd,
-                                     stdout=subprocess.PIPE,
-                                     stderr=subprocess.PIPE,
-                                     shell=True,
-                                     text=True,
-                                     encoding='utf-8',
-                                     errors='ignore')
                 out, err = p.communicate(timeout=15)
-                if not out:
-                    continue
-
-                networks = {}
-                current_ssid = None
-                lines = out.split('\n')
-
-                for line in lines:
-                    line = line.strip()
-                    ssid_match = re.match(r'(?:SSID\s*\d*\s*|Profile\s*):\s*(.+)', line)
-                    if ssid_match:
-                        current_ssid = ssid_match.group(1).strip()
-                        if current_ssid and current_ssid not in networks:
-                            networks[current_ssid] = []
-                        continue
-
-                    signal_match = re.search(r'Signal\s*:\s*(\d+)%', line)
-                    if signal_match and current_ssid:
-                        networks[current_ssid].append(int(signal_match.group(1)))
-
-                # Convert to strongest signal for each SSID
-                result = {}
-                for ssid, signals in networks.items():
-                    if signals:
-                        # convert % to dBm
-                        signal_dbm = max(signals) / 2 - 100
-                        result[ssid] = signal_dbm
-                    else:
-                        result[ssid] = -100
-                if result:
-                    return result
             except subprocess.TimeoutExpired:
-                continue
-            except Exception:
-                continue
+                p.kill()
+                p.communicate()
+                return {}
+        if not out:
+            return {}
+        with profiler.stage('scan.decode'):
+            out = decode_output(out)
+
+        # -100 dBm when no signal is reported
+        with profiler.stage('scan.parse'):
+            return {ssid: signal / 2 - 100
+                    for ssid, signal in strongest_by_ssid(parse_networks(out), default=0).items()}
+    except Exception:
         return {}
+
+# Remembers the command that worked, the others are only re-probed on failure
+scan_chain = CommandChain([(cmd, functools.partial(run_scan_command, cmd)) for cmd in SCAN_COMMANDS],
+                          empty={})
+
+@profiler.timed('scan')
+def scan_available_wifis():
+    """Scan for all available WiFi networks using multiple methods"""
+    try:
+        return scan_chain()
     except Exception:
         return {}
 
+@profiler.timed('connected')
 def get_connected_wifi():
     """Get connected WiFi information"""
     try:
-        p = subprocess.Popen("netsh wlan show interfaces",
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE,
-                             shell=True,
-                             text=True,
-                             encoding='utf-8')
-        out, err = p.communicate(timeout=10)
+        with profiler.stage('connected.subprocess'):
+            p = subprocess.Popen("netsh wlan show interfaces",
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 shell=True)
+            out, err = p.communicate(timeout=10)
         if not out:
             return None, None
 
-        ssid = None
-        signal_dbm = None
-
-        for line in out.split('\n'):
-            line = line.strip()
-            if 'SSID' in line and 'BSSID' not in line:
-                ssid_match = re.search(r'SSID\s*:\s*(.+)', line)
-                if ssid_match:
-                    ssid = ssid_match.group(1).strip()
-            if 'Signal' in line:
-                signal_match = re.search(r'(\d+)%', line)
-                if signal_match:
-                    signal_percent = int(signal_match.group(1))
-                    signal_dbm = signal_percent / 2 - 100  # convert to dBm
+        with profiler.stage('connected.parse'):
+            ssid, signal_percent = connected_wifi(parse_interfaces(decode_output(out)))
+        signal_dbm = signal_percent / 2 - 100 if signal_percent is not None else None  # convert to dBm
         return ssid, signal_dbm
     except Exception:
         return None, None
 
 # ----------------- Data Storage -----------------
 
-wifi_data = collections.defaultdict(lambda: {'x': [], 'y': []})
+wifi_data = SeriesStore(capacity=50,  # last 50 samples per SSID, preallocated
+                        ttl=NETWORK_TTL, max_keys=MAX_NETWORKS)  # vanished networks are dropped
+rollups = SeriesStore(factory=Rollup, max_keys=MAX_NETWORKS)  # 1 min / 1 h min-mean-max per SSID
+ranking = TopK(-100, 0)  # SSIDs by latest signal, kept up to date as samples arrive
+rollup_ranking = TopK(-100, 0)  # the same for every SSID rollups still hold (zoomed views)
 start_time = datetime.now()
+start_ms = int(start_time.timestamp() * 1000)
 
 # ----------------- Plot Setup -----------------
 
@@ -130,63 +110,114 @@ ax2.set_title('Connected WiFi')
 ax2.set_ylim(-100, 0)
 ax2.legend(fontsize=8)
 
+blitter = Blitter(fig.canvas)
+panel1 = SignalPanel(ax1, blitter, start_ms, 'o-', linewidth=2, colors=plt.cm.tab10.colors, fontsize=8)
+panel2 = SignalPanel(ax2, blitter, start_ms, 'bo-', linewidth=3, fontsize=10)
+
+
+def forget_samples(ssid):
+    """Stop ranking a network evicted from wifi_data; the zoomed views may still draw it"""
+    ranking.discard(ssid)
+    if ssid not in rollups:
+        forget_network(ssid)
+
+
+def forget_network(ssid):
+    """Drop the lines of a network evicted from rollups"""
+    panel1.discard(ssid)
+    panel2.discard(ssid)
+    rollup_ranking.discard(ssid)
+
+
+wifi_data.on_evict = forget_samples
+rollups.on_evict = forget_network
+
+# Press 'z' to zoom out: raw samples over 2 min, then 1 min means over 2 h, 1 h means over 2 days
+VIEWS = [('', None, 120), (' - 1 min means', 60, 2 * 3600), (' - 1 h means', 3600, 2 * 86400)]
+view = 0
+zoomed = False
+
+
+def on_key(event):
+    global view, zoomed
+    if event.key == 'z':
+        view = (view + 1) % len(VIEWS)
+        panel1.set_window(VIEWS[view][2])
+        panel2.set_window(VIEWS[view][2])
+        zoomed = True
+
+
+fig.canvas.mpl_connect('key_press_event', on_key)
+
+
+def view_store():
+    """Raw samples or rollups, for the current zoom level"""
+    return wifi_data if VIEWS[view][1] is None else rollups
+
+
+def view_ranking():
+    """Ranking of the networks in view_store()"""
+    return ranking if VIEWS[view][1] is None else rollup_ranking
+
+
+def view_series(data):
+    """What to draw of one network's raw series / Rollup"""
+    return data if VIEWS[view][1] is None else data.level(VIEWS[view][1])
+
 # ----------------- Update Function -----------------
 
-def update(frame):
-    current_time = (datetime.now() - start_time).total_seconds()
+@profiler.timed('update')
+def update():
+    global zoomed
+    profiler.tick()  # periodic p50/p95/p99 report when profiling is on
 
-    networks = scan_available_wifis()
-    connected_ssid, connected_signal = get_connected_wifi()
+    # Scans run on the sampler thread; only draw what it has collected so far
+    samples = sampler.buffer.drain()
+    if not samples and not zoomed:
+        return
+    latest = samples[-1] if samples else sampler.buffer.latest()
+    zoomed = False
+    if latest is None:
+        return
 
     # Update data for all networks
-    for ssid, signal_dbm in networks.items():
-        wifi_data[ssid]['x'].append(current_time)
-        wifi_data[ssid]['y'].append(signal_dbm)
-        if len(wifi_data[ssid]['x']) > 50:
-            wifi_data[ssid]['x'] = wifi_data[ssid]['x'][-50:]
-            wifi_data[ssid]['y'] = wifi_data[ssid]['y'][-50:]
-
-    ax1.clear()
-    ax2.clear()
-    setup_signal_zones(ax1)
-    setup_signal_zones(ax2)
-
-    colors = plt.cm.tab10.colors
-
-    # Plot available WiFi networks
-    for i, (ssid, data) in enumerate(list(wifi_data.items())[:8]):
-        if data['x'] and data['y']:
-            color = colors[i % len(colors)]
-            ax1.plot(data['x'], data['y'], 'o-', linewidth=2,
-                     color=color, label=ssid[:15] + '...' if len(ssid) > 15 else ssid)
-            ax1.text(current_time, data['y'][-1] + 1, f"{data['y'][-1]:.0f}", fontsize=8, color=color)
-
-    # Plot connected WiFi
-    if connected_ssid and connected_ssid in wifi_data:
-        data = wifi_data[connected_ssid]
-        ax2.plot(data['x'], data['y'], 'bo-', linewidth=3, label=f"{connected_ssid}")
-        ax2.text(current_time, data['y'][-1] + 1, f"{data['y'][-1]:.0f}", fontsize=10, color='blue')
-
-    # Update axes
-    ax1.set_xlabel('Time (s)')
-    ax1.set_ylabel('Signal Strength (dBm)')
-    ax1.set_title(f'Available WiFi Networks ({len(networks)} found)')
-    ax1.set_ylim(-100, 0)
-    ax1.legend(fontsize=8)
-
-    ax2.set_xlabel('Time (s)')
-    ax2.set_ylabel('Signal Strength (dBm)')
-    ax2.set_title(f'Connected: {connected_ssid or "None"}')
-    ax2.set_ylim(-100, 0)
-    ax2.legend(fontsize=8)
-
-    time_window = 120
-    ax1.set_xlim(max(0, current_time - time_window), current_time + 5)
-    ax2.set_xlim(max(0, current_time - time_window), current_time + 5)
-
-    return []
+    with profiler.stage('update.store'):
+        for sample in samples:
+            sample_ms = int(sample.time * 1000)
+            for ssid, signal_dbm in sample.networks.items():
+                wifi_data.append(ssid, sample_ms, signal_dbm)
+                rollups.append(ssid, sample_ms, signal_dbm)
+                ranking.update(ssid, signal_dbm)
+                rollup_ranking.update(ssid, signal_dbm)
+
+    current_time = latest.time - start_time.timestamp()
+    networks = latest.networks
+    connected_ssid, connected_signal = latest.connected_ssid, latest.connected_signal
+
+    # Only the lines and value labels are redrawn; zones, labels and legend stay cached
+    with profiler.stage('update.panels'):
+        store = view_store()
+        # Strongest first: 8 labelled lines, the rest of the top networks as thin lines
+        entries = [(ssid, ssid[:15] + '...' if len(ssid) > 15 else ssid, view_series(store[ssid]))
+                   for ssid in view_ranking().top(TOP_NETWORKS) if ssid in store]
+        panel1.set_title(f'Available WiFi Networks ({len(networks)} found){VIEWS[view][0]}')
+        stale = panel1.update(entries, current_time)
+
+        connected = []
+        if connected_ssid and connected_ssid in store:
+            connected = [(connected_ssid, f"{connected_ssid}", view_series(store[connected_ssid]))]
+        panel2.set_title(f'Connected: {connected_ssid or "None"}{VIEWS[view][0]}')
+        stale = panel2.update(connected, current_time) or stale
+
+    with profiler.stage('update.draw'):
+        blitter.update(full=stale)
 
 # ----------------- Start Animation -----------------
 
-animation = FuncAnimation(fig, update, interval=5000, cache_frame_data=False, blit=False)
+sampler = Sampler(scan_available_wifis, get_connected_wifi, interval=5).start()
+# A plain canvas timer, not FuncAnimation: FuncAnimation redraws the whole figure after
+# every frame that returns no artists, here only the Blitter draws (and only on new data)
+timer = fig.canvas.new_timer(interval=1000)
+timer.add_callback(update)
+timer.start()
 plt.show()
@@ -1,117 +1,96 @@
 import subprocess
-import re
 import platform
 from datetime import datetime
-from matplotlib.animation import FuncAnimation
 from matplotlib import pyplot as plt
-import collections
 import time
-
-
-def scan_available_wifis():
-    """Scan for all available WiFi networks using multiple methods"""
+import os
+import functools
+from wifimon.parser import parse_networks, parse_interfaces, strongest_by_ssid, connected_wifi
+from wifimon.sampler import Sampler
+from wifimon.store import SeriesStore, NETWORK_TTL, MAX_NETWORKS
+from wifimon.rollup import Rollup
+from wifimon.topk import TopK, TOP_NETWORKS
+from wifimon.render import Blitter, SignalPanel
+from wifimon.scan import SCAN_COMMANDS, CommandChain, decode_output
+from wifimon.timing import profiler
+from wifimon.capture import CaptureArchive
+from wifimon.database import SqliteSink
+
+# Raw netsh outputs are only archived when WIFIMON_CAPTURE names a file
+capture = CaptureArchive(os.environ['WIFIMON_CAPTURE']) if os.environ.get('WIFIMON_CAPTURE') else None
+# Samples are only stored in SQLite when WIFIMON_DB names a database file (inserted in the background)
+database = SqliteSink(os.environ['WIFIMON_DB']) if os.environ.get('WIFIMON_DB') else None
+
+
+def store_records(records=(), interfaces=()):
+    """Queue parsed BSSID / interface records (with BSSID and channel) for the database"""
+    if database is not None:
+        database.write_scan(time.time(), records, interfaces)
+
+
+def run_scan_command(cmd):
+    """Run one netsh scan command and parse it (empty dict when it fails)"""
     try:
-        print("Scanning for WiFi networks...")
-
-        # Method 1: Try the basic networks command first
-        commands = [
-            "netsh wlan show networks mode=bssid",
-            "netsh wlan show networks",
-            "netsh wlan show all"
-        ]
+        print(f"Trying command: {cmd}")
+        with profiler.stage('scan.subprocess'):
+            p = subprocess.Popen(cmd,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 shell=True)
 
-        for cmd in commands:
             try:
-                print(f"Trying command: {cmd}")
-                p = subprocess.Popen(cmd,
-                                     stdout=subprocess.PIPE,
-                                     stderr=subprocess.PIPE,
-                                     shell=True,
-                                     text=True,
-                                     encoding='utf-8',
-                                     errors='ignore')
-
                 out, err = p.communicate(timeout=15)
-
-                if err:
-                    print(f"Command error: {err}")
-                    continue
-
-                if not out:
-                    print("No output from command")
-                    continue
-
-                print(f"Command output length: {len(out)} characters")
-
-                # Save output to file for debugging
-                with open("wifi_scan_debug.txt", "w", encoding='utf-8') as f:
-                    f.write(out)
-
-                # Parse networks - try different patterns
-                networks = {}
-                current_ssid = None
-                current_signal = None
-
-                lines = out.split('\n')
-                for i, line in enumerate(lines):
-                    line = line.strip()
-
-                    # Try different SSID patterns
-                    ssid_patterns = [
-                        r'SSID\s*\d+\s*:\s*(.+)',
-                        r'SSID\s*:\s*(.+)',
-                        r'Profile\s*:\s*(.+)'
-                    ]
-
-                    for pattern in ssid_patterns:
-                        ssid_match = re.match(pattern, line, re.IGNORECASE)
-                        if ssid_match:
-                            current_ssid = ssid_match.group(1).strip()
-                            if current_ssid and current_ssid not in networks:
-                                networks[current_ssid] = []
-                            break
-
-                    # Try different signal patterns
-                    signal_patterns = [
-                        r'Signal\s*:\s*(\d+)%',
-                        r'Signal\s*Quality\s*:\s*(\d+)',
-                        r'Strength\s*:\s*(\d+)'
-                    ]
-
-                    for pattern in signal_patterns:
-                        signal_match = re.search(pattern, line, re.IGNORECASE)
-                        if signal_match:
-                            current_signal = int(signal_match.group(1))
-                            if current_ssid and current_signal is not None:
-                                networks[current_ssid].append(current_signal)
-                            break
-
-                # For each network, use the strongest signal
-                result = {}
-                for ssid, signals in networks.items():
-                    if signals:
-                        result[ssid] = max(signals)
-                    else:
-                        # If no signal found, set to 0 or try to get from other methods
-                        result[ssid] = 0
-
-                if result:
-                    print(f"Success with command: {cmd}")
-                    print(f"Found {len(result)} networks: {list(result.keys())}")
-                    return result
-                else:
-                    print(f"No networks found with command: {cmd}")
-
             except subprocess.TimeoutExpired:
-                print(f"Command timed out: {cmd}")
-                continue
-            except Exception as e:
-                print(f"Error with command {cmd}: {e}")
-                continue
+                p.kill()
+                p.communicate()
+                raise
+
+        if err:
+            print(f"Command error: {decode_output(err)}")
+            return {}
+
+        if not out:
+            print("No output from command")
+            return {}
+
+        with profiler.stage('scan.decode'):
+            out = decode_output(out)
+
+        print(f"Command output length: {len(out)} characters")
+
+        # Archive the raw output for debugging (opt-in, written in the background)
+        if capture is not None:
+            capture.record(out, cmd)
+
+        # Parse networks in one pass, keeping the strongest signal per SSID
+        with profiler.stage('scan.parse'):
+            records = parse_networks(out)
+            result = strongest_by_ssid(records)
+        store_records(records)
+
+        if result:
+            print(f"Success with command: {cmd}")
+            print(f"Found {len(result)} networks: {list(result.keys())}")
+        else:
+            print(f"No networks found with command: {cmd}")
+        return result
+
+    except subprocess.TimeoutExpired:
+        print(f"Command timed out: {cmd}")
+        return {}
+    except Exception as e:
+        print(f"Error with command {cmd}: {e}")
+        return {}
+
 
-        # If all commands fail, try a fallback method
-        print("Trying fallback method...")
-        return fallback_wifi_scan()
+@profiler.timed('scan')
+def scan_available_wifis():
+    """Scan for all available WiFi networks using multiple methods"""
+    try:
+        print("Scanning for WiFi networks...")
+        # Goes straight to the command that worked last time, the others
+        # (and the PowerShell fallback) are only tried when it fails
+        return scan_chain()
 
     except Exception as e:
         print(f"Error in WiFi scan: {e}")
@@ -129,38 +108,18 @@ def fallback_wifi_scan():
 
         p = subprocess.Popen(["powershell", "-Command", ps_command],
                              stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE,
-                             text=True,
-                             encoding='utf-8')
+                             stderr=subprocess.PIPE)
 
         out, err = p.communicate(timeout=20)
+        out = decode_output(out)  # console code page, like netsh's own output
 
         if out:
-            # Simple parsing - look for SSID and Signal patterns
-            networks = {}
-            lines = out.split('\n')
-
-            for line in lines:
-                line = line.strip()
-                # Look for SSID
-                if 'SSID' in line and 'BSSID' not in line:
-                    ssid_match = re.search(r'SSID\s*\d*\s*:\s*(.+)', line)
-                    if ssid_match:
-                        ssid = ssid_match.group(1).strip()
-                        networks[ssid] = networks.get(ssid, 0)
-
-                # Look for Signal
-                elif 'Signal' in line:
-                    signal_match = re.search(r'(\d+)%', line)
-                    if signal_match and networks:
-                        signal = int(signal_match.group(1))
-                        # Assign to last found SSID
-                        last_ssid = list(networks.keys())[-1] if networks else None
-                        if last_ssid:
-                            networks[last_ssid] = max(networks[last_ssid], signal)
-
+            if capture is not None:
+                capture.record(out, "powershell")
             # Remove networks with 0 signal
-            networks = {k: v for k, v in networks.items() if v > 0}
+            records = parse_networks(out)
+            store_records(records)
+            networks = {k: v for k, v in strongest_by_ssid(records).items() if v > 0}
 
             if networks:
                 print(f"Fallback found {len(networks)} networks")
@@ -173,35 +132,30 @@ def fallback_wifi_scan():
         return {}
 
 
+# netsh commands first, PowerShell fallback last
+scan_chain = CommandChain(
+    [(cmd, functools.partial(run_scan_command, cmd)) for cmd in SCAN_COMMANDS]
+    + [("powershell", fallback_wifi_scan)],
+    empty={})
+
+
+@profiler.timed('connected')
 def get_connected_wifi():
     """Get connected WiFi information"""
     try:
-        p = subprocess.Popen("netsh wlan show interfaces",
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE,
-                             shell=True,
-                             text=True,
-                             encoding='utf-8')
+        with profiler.stage('connected.subprocess'):
+            p = subprocess.Popen("netsh wlan show interfaces",
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 shell=True)
 
-        out, err = p.communicate(timeout=10)
+            out, err = p.communicate(timeout=10)
 
         if out:
-            ssid = None
-            signal = None
-
-            for line in out.split('\n'):
-                line = line.strip()
-                if 'SSID' in line and 'BSSID' not in line:
-                    ssid_match = re.search(r'SSID\s*:\s*(.+)', line)
-                    if ssid_match:
-                        ssid = ssid_match.group(1).strip()
-
-                if 'Signal' in line:
-                    signal_match = re.search(r'(\d+)%', line)
-                    if signal_match:
-                        signal = int(signal_match.group(1))
-
-            return ssid, signal
+            with profiler.stage('connected.parse'):
+                interfaces = parse_interfaces(decode_output(out))
+            store_records(interfaces=interfaces)
+            return connected_wifi(interfaces)
 
         return None, None
 
@@ -211,8 +165,13 @@ def get_connected_wifi():
 
 
 # Initialize data storage
-wifi_data = collections.defaultdict(lambda: {'x': [], 'y': []})
+wifi_data = SeriesStore(capacity=50,  # last 50 samples per SSID, preallocated
+                        ttl=NETWORK_TTL, max_keys=MAX_NETWORKS)  # vanished networks are dropped
+rollups = SeriesStore(factory=Rollup, max_keys=MAX_NETWORKS)  # 1 min / 1 h min-mean-max per SSID
+ranking = TopK(0, 100)  # SSIDs by latest signal, kept up to date as samples arrive
+rollup_ranking = TopK(0, 100)  # the same for every SSID rollups still hold (zoomed views)
 start_time = datetime.now()
+start_ms = int(start_time.timestamp() * 1000)
 
 # Create the plot
 print("Setting up visualization...")
@@ -246,6 +205,63 @@ ax2.set_title('Connected WiFi')
 ax2.set_ylim(0, 100)
 ax2.legend()
 
+# Persistent lines, redrawn over a cached background
+blitter = Blitter(fig.canvas)
+panel1 = SignalPanel(ax1, blitter, start_ms, 'o-', linewidth=2, colors=plt.cm.tab10.colors,
+                     fontsize=8, value_fmt='{:.0f}%', value_offset=2, hysteresis=10)  # 10 % ~ 5 dBm
+panel2 = SignalPanel(ax2, blitter, start_ms, 'bo-', linewidth=3, fontsize=10,
+                     value_fmt='{:.0f}%', value_offset=2, legend_fontsize=None)
+
+
+def forget_samples(ssid):
+    """Stop ranking a network evicted from wifi_data; the zoomed views may still draw it"""
+    ranking.discard(ssid)
+    if ssid not in rollups:
+        forget_network(ssid)
+
+
+def forget_network(ssid):
+    """Drop the lines of a network evicted from rollups"""
+    panel1.discard(ssid)
+    panel2.discard(ssid)
+    rollup_ranking.discard(ssid)
+
+
+wifi_data.on_evict = forget_samples
+rollups.on_evict = forget_network
+
+# Press 'z' to zoom out: raw samples over 2 min, then 1 min means over 2 h, 1 h means over 2 days
+VIEWS = [('', None, 120), (' - 1 min means', 60, 2 * 3600), (' - 1 h means', 3600, 2 * 86400)]
+view = 0
+zoomed = False
+
+
+def on_key(event):
+    global view, zoomed
+    if event.key == 'z':
+        view = (view + 1) % len(VIEWS)
+        panel1.set_window(VIEWS[view][2])
+        panel2.set_window(VIEWS[view][2])
+        zoomed = True
+
+
+fig.canvas.mpl_connect('key_press_event', on_key)
+
+
+def view_store():
+    """Raw samples or rollups, for the current zoom level"""
+    return wifi_data if VIEWS[view][1] is None else rollups
+
+
+def view_ranking():
+    """Ranking of the networks in view_store()"""
+    return ranking if VIEWS[view][1] is None else rollup_ranking
+
+
+def view_series(data):
+    """What to draw of one network's raw series / Rollup"""
+    return data if VIEWS[view][1] is None else data.level(VIEWS[view][1])
+
 # Manual test first
 print("\n=== MANUAL TEST ===")
 print("Testing WiFi scan...")
@@ -261,74 +277,56 @@ if not test_networks and connected_ssid:
     print("This suggests a permission issue. Please run as Administrator.")
 
 
-def update(frame):
+@profiler.timed('update')
+def update():
+    global zoomed
+    profiler.tick()  # periodic p50/p95/p99 report when profiling is on
     try:
-        current_time = (datetime.now() - start_time).total_seconds()
-
-        # Scan for networks
-        networks = scan_available_wifis()
-        connected_ssid, connected_signal = get_connected_wifi()
+        # Scans run on the sampler thread; only draw what it has collected so far
+        samples = sampler.buffer.drain()
+        if not samples and not zoomed:
+            return
+        latest = samples[-1] if samples else sampler.buffer.latest()
+        zoomed = False
+        if latest is None:
+            return
 
         # Update data
-        for ssid, signal in networks.items():
-            wifi_data[ssid]['x'].append(current_time)
-            wifi_data[ssid]['y'].append(signal)
-
-            # Keep data manageable
-            if len(wifi_data[ssid]['x']) > 50:
-                wifi_data[ssid]['x'] = wifi_data[ssid]['x'][-50:]
-                wifi_data[ssid]['y'] = wifi_data[ssid]['y'][-50:]
-
-        # Clear and redraw
-        ax1.clear()
-        ax2.clear()
-        setup_signal_zones(ax1)
-        setup_signal_zones(ax2)
-
-        # Plot available networks
-        colors = plt.cm.tab10.colors
-        for i, (ssid, data) in enumerate(list(wifi_data.items())[:8]):  # Limit to 8 networks
-            if data['x'] and data['y']:
-                color = colors[i % len(colors)]
-                ax1.plot(data['x'], data['y'], 'o-', linewidth=2,
-                         color=color, label=ssid[:15] + '...' if len(ssid) > 15 else ssid)
-                # Add current value
-                if data['y']:
-                    ax1.text(current_time, data['y'][-1] + 2, f"{data['y'][-1]}%",
-                             fontsize=8, color=color)
-
-        # Plot connected network
-        if connected_ssid and connected_ssid in wifi_data:
-            data = wifi_data[connected_ssid]
-            if data['x'] and data['y']:
-                ax2.plot(data['x'], data['y'], 'bo-', linewidth=3,
-                         label=f"{connected_ssid} ({connected_signal}%)")
-                ax2.text(current_time, data['y'][-1] + 2, f"{data['y'][-1]}%",
-                         fontsize=10, color='blue')
-
-        # Update plot settings
-        ax1.set_xlabel('Time (s)')
-        ax1.set_ylabel('Signal Strength (%)')
-        ax1.set_title(f'Available WiFi Networks ({len(networks)} found)')
-        ax1.set_ylim(0, 100)
-        ax1.legend(fontsize=8)
-
-        ax2.set_xlabel('Time (s)')
-        ax2.set_ylabel('Signal Strength (%)')
-        ax2.set_title(f'Connected: {connected_ssid or "None"}')
-        ax2.set_ylim(0, 100)
-        ax2.legend()
-
-        # Auto-scale time axis
-        time_window = 120  # Show last 2 minutes
-        ax1.set_xlim(max(0, current_time - time_window), current_time + 5)
-        ax2.set_xlim(max(0, current_time - time_window), current_time + 5)
+        with profiler.stage('update.store'):
+            for sample in samples:
+                sample_ms = int(sample.time * 1000)
+                for ssid, signal in sample.networks.items():
+                    wifi_data.append(ssid, sample_ms, signal)
+                    rollups.append(ssid, sample_ms, signal)
+                    ranking.update(ssid, signal)
+                    rollup_ranking.update(ssid, signal)
+
+        current_time = latest.time - start_time.timestamp()
+        networks = latest.networks
+        connected_ssid, connected_signal = latest.connected_ssid, latest.connected_signal
+
+        # Only the lines and value labels are redrawn; zones, labels and legend stay cached
+        with profiler.stage('update.panels'):
+            store = view_store()
+            # Strongest first: 8 labelled lines, the rest of the top networks as thin lines
+            entries = [(ssid, ssid[:15] + '...' if len(ssid) > 15 else ssid, view_series(store[ssid]))
+                       for ssid in view_ranking().top(TOP_NETWORKS) if ssid in store]
+            panel1.set_title(f'Available WiFi Networks ({len(networks)} found){VIEWS[view][0]}')
+            stale = panel1.update(entries, current_time)
+
+            # Plot connected network (its current % is shown next to the line)
+            connected = []
+            if connected_ssid and connected_ssid in store:
+                connected = [(connected_ssid, connected_ssid, view_series(store[connected_ssid]))]
+            panel2.set_title(f'Connected: {connected_ssid or "None"}{VIEWS[view][0]}')
+            stale = panel2.update(connected, current_time) or stale
+
+        with profiler.stage('update.draw'):
+            blitter.update(full=stale)
 
     except Exception as e:
         print(f"Update error: {e}")
 
-    return []
-
 
 print("\n=== STARTING MONITOR ===")
 print("If no networks appear, please:")
@@ -336,6 +334,11 @@ print("1. Run this script as Administrator")
 print("2. Check if WiFi is enabled on your PC")
 print("3. Wait a few seconds for scans to complete")
 
-# Start animation
-animation = FuncAnimation(fig, update, interval=5000, cache_frame_data=False, blit=False)
+# Start sampling in the background, then animation
+sampler = Sampler(scan_available_wifis, get_connected_wifi, interval=5).start()
+# A plain canvas timer, not FuncAnimation: FuncAnimation redraws the whole figure after
+# every frame that returns no artists, here only the Blitter draws (and only on new data)
+timer = fig.canvas.new_timer(interval=1000)
+timer.add_callback(update)
+timer.start()
 plt.show()
\ No newline at end of file
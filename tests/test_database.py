@@ -0,0 +1,32 @@
+import os
+
+from wifimon.database import SampleDatabase, SqliteSink
+from wifimon.parser import parse_interfaces, parse_networks
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_scans_keep_bssid_and_channel(tmp_path):
+    path = str(tmp_path / 'samples.db')
+    sink = SqliteSink(path)
+    records = parse_networks(fixture('netsh_networks.txt'))
+    sink.write_scan(100.0, records)
+    sink.write_scan(105.0, records, parse_interfaces(fixture('netsh_interfaces.txt')))
+    sink.close()
+    assert (sink.written, sink.dropped) == (9, 0)
+
+    with SampleDatabase(path) as db:
+        assert db.ssids() == ['', 'Café', 'HomeNet']  # hidden networks keep an empty SSID
+        rows = db.query(channel=36)
+        assert rows['ts'].tolist() == [100.0, 105.0]
+        assert rows['signal'].tolist() == [88.0, 88.0]
+        assert db.query(channel=36, kind='connected')['ts'].tolist() == [105.0]
+        times, signals = db.series('HomeNet', start=101)
+        assert times.tolist() == [105.0, 105.0] and signals.tolist() == [88.0, 40.0]
+        bssids = {row[0] for row in db._db.execute("SELECT bssid FROM samples WHERE channel = 6")}
+        assert bssids == {'aa:bb:cc:dd:ee:02'}
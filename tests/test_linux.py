@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from wifimon.linux import (LinuxBackend, dbm_to_percent, freq_to_channel, parse_iw_link,
+                           parse_iw_scan, parse_nmcli, parse_proc_wireless)
+from wifimon.parser import BssidRecord, InterfaceRecord
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+PROC = os.path.join(FIXTURES, 'proc_net_wireless.txt')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+SCAN = [
+    BssidRecord('HomeNet', 'aa:bb:cc:dd:ee:01', 88, 36, '802.11ax', '5 GHz'),
+    BssidRecord('HomeNet', 'aa:bb:cc:dd:ee:02', 40, 6, '802.11n', '2.4 GHz'),
+    BssidRecord('', 'aa:bb:cc:dd:ee:03', 20, 11, '802.11g', '2.4 GHz'),
+    BssidRecord('Café', 'aa:bb:cc:dd:ee:04', 100, 44, '802.11ac', '5 GHz'),
+]
+
+
+class FakeRun:
+    """cmd -> canned output, recording the commands it was asked for"""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.calls = []
+
+    def __call__(self, cmd, timeout=15):
+        self.calls.append(cmd)
+        for prefix, out in self.outputs.items():
+            if cmd.startswith(prefix):
+                return out
+        return ''
+
+
+def test_conversions():
+    assert [dbm_to_percent(d) for d in (-110, -100, -75, -50, -30)] == [0, 0, 50, 100, 100]
+    assert [freq_to_channel(f) for f in (2412, 2484, 5180, 5955, 900)] == [1, 14, 36, 1, None]
+
+
+def test_parse_proc_wireless():
+    links = parse_proc_wireless(fixture('proc_net_wireless.txt'))
+    assert links == {'wlp2s0': (54.0, -56.0, -256.0),
+                     'wlan1': (0.0, -56.0, -256.0)}  # level 200 is an unsigned byte
+    assert parse_proc_wireless('') == {}
+
+
+def test_parse_iw_scan():
+    assert parse_iw_scan(fixture('iw_scan_dump.txt')) == SCAN
+    assert parse_iw_scan('') == []
+
+
+def test_parse_iw_link():
+    assert parse_iw_link(fixture('iw_link.txt')) == ('HomeNet', 'aa:bb:cc:dd:ee:01', 5180.0)
+    assert parse_iw_link('Not connected.\n') is None
+
+
+def test_parse_nmcli():
+    records = parse_nmcli(fixture('nmcli_wifi_list.txt'))
+    assert [(r.ssid, r.bssid, r.signal, r.channel, r.band) for r in records] == [
+        ('HomeNet', 'aa:bb:cc:dd:ee:01', 88, 36, '5 GHz'),
+        ('HomeNet', 'aa:bb:cc:dd:ee:02', 40, 6, '2.4 GHz'),
+        ('', 'aa:bb:cc:dd:ee:03', 20, 11, '2.4 GHz'),
+        ('Café: guest', 'aa:bb:cc:dd:ee:04', 100, 44, '5 GHz'),  # escaped colon kept in the SSID
+    ]
+
+
+def test_backend_networks_from_iw():
+    run = FakeRun({'iw dev wlp2s0 scan dump': fixture('iw_scan_dump.txt')})
+    backend = LinuxBackend('wlp2s0', proc_path=PROC, run=run)
+    assert backend.networks() == SCAN
+    assert run.calls == ['iw dev wlp2s0 scan dump']
+
+
+def test_backend_falls_back_to_nmcli():
+    run = FakeRun({'nmcli ': fixture('nmcli_wifi_list.txt')})
+    backend = LinuxBackend(proc_path=PROC, run=run)
+    assert [r.bssid for r in backend.networks()] == [r.bssid for r in SCAN]
+    assert run.calls[-1] == 'nmcli -t -f SSID,BSSID,SIGNAL,CHAN,FREQ device wifi list'
+
+
+def test_backend_interfaces_cache_the_link():
+    now = [0.0]
+    run = FakeRun({'iw dev wlp2s0 link': fixture('iw_link.txt')})
+    backend = LinuxBackend(proc_path=PROC, run=run, link_ttl=30, clock=lambda: now[0])
+    interfaces = backend.interfaces()
+    assert interfaces == [
+        InterfaceRecord('wlp2s0', 'connected', 'HomeNet', 'aa:bb:cc:dd:ee:01', 88, 36, None,
+                        '5 GHz', -56),
+        InterfaceRecord('wlan1', 'disconnected', None, None, 88, None, None, None, -56),
+    ]
+    calls = len(run.calls)
+    now[0] = 10.0
+    assert backend.interfaces() == interfaces
+    assert len(run.calls) == calls  # link info cached, only /proc read again
+    now[0] = 31.0
+    backend.interfaces()
+    assert len(run.calls) == 2 * calls
+
+
+@pytest.mark.parametrize('path', [os.path.join(FIXTURES, 'missing'), FIXTURES])
+def test_backend_without_proc(path):
+    backend = LinuxBackend(proc_path=path, run=FakeRun({}))
+    assert backend.interfaces() == []
+    assert backend.networks() == []
@@ -0,0 +1,32 @@
+import contextlib
+import io
+import itertools
+import os
+
+import pytest
+
+from wifimon.render import SignalPanel
+from wifimon.replay import ReplaySource, run_frontend
+from wifimon.synth import NetshGenerator
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('script', ['ex3.py', 'test.py'])
+def test_dense_drifting_site_is_blitted(script, monkeypatch):
+    """300 BSSIDs drifting every scan: frames stay blits, the legend rarely changes"""
+    from matplotlib import pyplot as plt
+
+    legends = []
+    update_legend = SignalPanel._update_legend
+    monkeypatch.setattr(SignalPanel, '_update_legend',
+                        lambda self: legends.append(self) or update_legend(self))
+    ticks = itertools.count()
+    # Two outputs (networks, interfaces) per sample: every sample is the next 5 s scan
+    source = ReplaySource(NetshGenerator(300, drift=2.0, seed=0).recording(steps=40),
+                          clock=lambda: next(ticks) * 2.5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = run_frontend(os.path.join(REPO_DIR, script), source, frames=20, pace=False)
+    plt.close('all')
+    assert report.full_draws <= report.frames // 4
+    assert len(legends) <= report.frames // 4
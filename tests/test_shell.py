@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from wifimon.parser import connected_wifi, parse_interfaces, parse_networks
+from wifimon.shell import PersistentShell
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='the netsh stand-in is a POSIX script')
+
+
+@pytest.fixture
+def shell():
+    """PersistentShell finding the canned netsh (tests/fixtures/netsh) first on PATH"""
+    env = dict(os.environ, PATH=FIXTURES + os.pathsep + os.environ.get('PATH', ''))
+    env.pop('NETSH_DELAY', None)
+    with PersistentShell(env=env, timeout=10) as sh:
+        yield sh
+
+
+def test_run_returns_status_and_output(shell):
+    status, out = shell.run('netsh wlan show networks mode=bssid')
+    assert status == 0
+    assert [r.bssid for r in parse_networks(out)] == [
+        'aa:bb:cc:dd:ee:01', 'aa:bb:cc:dd:ee:02', 'aa:bb:cc:dd:ee:03', 'aa:bb:cc:dd:ee:04']
+    assert connected_wifi(parse_interfaces(shell.output('netsh wlan show interfaces'))) == ('HomeNet', 88)
+    assert shell.run('netsh wlan show profiles')[0] == 1
+    assert shell.output('netsh wlan show profiles') == ''
+    assert shell.restarts == 0
+
+
+def test_one_process_for_every_command(shell):
+    shell.run('true')
+    pid = shell._proc.pid
+    for _ in range(3):
+        shell.run('netsh wlan show interfaces')
+    assert shell._proc.pid == pid
+
+
+def test_timeout_kills_and_restarts_the_shell(shell):
+    with pytest.raises(subprocess.TimeoutExpired):
+        shell.run('NETSH_DELAY=5 netsh wlan show interfaces', timeout=0.5)
+    assert shell.restarts == 1
+    assert shell.output('NETSH_DELAY=5 netsh wlan show interfaces', timeout=0.5) == ''
+    assert shell.restarts == 2
+    status, out = shell.run('netsh wlan show interfaces')
+    assert status == 0 and 'HomeNet' in out
+
+
+def test_dead_shell_is_restarted(shell):
+    shell.run('true')
+    shell._proc.kill()
+    shell._proc.wait()
+    status, out = shell.run('netsh wlan show interfaces')
+    assert status == 0 and 'HomeNet' in out
+    assert shell.restarts == 1
+
+
+def test_command_ending_the_shell_is_not_sent_again(shell, tmp_path):
+    runs = tmp_path / 'runs'
+    assert shell.run(f'echo ran >> {runs}; exit 3') == (-1, '')
+    assert runs.read_text().splitlines() == ['ran']
+    assert shell.restarts == 1
+    assert shell.run('netsh wlan show interfaces')[0] == 0
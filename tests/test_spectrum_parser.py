@@ -0,0 +1,124 @@
+"""Fuzzing of tp2.3.py's extract_networks() on mutated synthetic netsh outputs"""
+
+import os
+import random
+import time
+
+import pytest
+
+from wifimon.replay import load_function
+from wifimon.synth import ADVERSARIAL, NetshGenerator
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+extract_networks = load_function(os.path.join(REPO_DIR, 'tp2.3.py'), 'extract_networks')
+
+SEED = 0
+ITERATIONS = 40
+# Generous: the parser runs at ~30 ns/byte; the old regex took seconds on 200 bytes
+NS_PER_BYTE = 2000
+MIN_BUDGET = 0.005
+
+
+def generators():
+    """Same (rng, NetshGenerator) sequence on every run: mixed sizes, languages and hidden SSIDs"""
+    rng = random.Random(SEED)
+    for _ in range(ITERATIONS):
+        yield rng, NetshGenerator(rng.randint(1, 300), per_ssid=rng.randint(1, 4), hidden=0.2,
+                                  lang=rng.choice(('en', 'fr')), seed=rng.randrange(1 << 30))
+
+
+def expected(records):
+    return [(r.ssid or "(hidden)", r.signal, r.channel) for r in records]
+
+
+def extract(text):
+    """extract_networks(text), checked against the per-byte time budget"""
+    t = time.perf_counter()
+    result = extract_networks(text)
+    elapsed = time.perf_counter() - t
+    budget = max(MIN_BUDGET, len(text) * NS_PER_BYTE * 1e-9)
+    assert elapsed <= budget, f"{elapsed * 1000:.1f} ms for {len(text)} bytes"
+    return result
+
+
+def _time(text):
+    t = time.perf_counter()
+    extract(text)
+    return time.perf_counter() - t
+
+
+def mutate(rng, lines):
+    """One random structural mutation of a list of lines"""
+    lines = list(lines)
+    kind = rng.randrange(7)
+    if kind == 0 and lines:  # drop lines
+        for _ in range(rng.randint(1, max(1, len(lines) // 10))):
+            lines.pop(rng.randrange(len(lines)))
+    elif kind == 1 and lines:  # duplicate lines
+        for _ in range(rng.randint(1, 10)):
+            i = rng.randrange(len(lines))
+            lines.insert(i, lines[i])
+    elif kind == 2:  # shuffle a window
+        i = rng.randrange(max(1, len(lines)))
+        window = lines[i:i + 20]
+        rng.shuffle(window)
+        lines[i:i + 20] = window
+    elif kind == 3 and lines:  # whitespace flood inside a line
+        i = rng.randrange(len(lines))
+        cut = rng.randrange(len(lines[i]) + 1)
+        lines[i] = lines[i][:cut] + rng.choice([' ', '\t', '\xa0']) * rng.randint(1000, 100000) + lines[i][cut:]
+    elif kind == 4 and lines:  # random characters
+        i = rng.randrange(len(lines))
+        chars = ''.join(chr(rng.randrange(1, 0x3000)) for _ in range(rng.randint(1, 50)))
+        lines[i] = chars + lines[i][rng.randrange(len(lines[i]) + 1):]
+    elif kind == 5:  # labels without values / colons
+        i = rng.randrange(len(lines) + 1)
+        lines[i:i] = [rng.choice(['SSID 9', 'Signal', 'Channel :', 'BSSID 1 :', 'Canal', ':', '%'])] * 50
+    else:  # strip '%' signs
+        lines = [line.replace('%', '') for line in lines]
+    return lines
+
+
+def test_complete_output():
+    for _, gen in generators():
+        assert extract(gen.networks_text()) == expected(gen.records())
+
+
+def test_truncated_output_gives_the_complete_bssids():
+    for rng, gen in generators():
+        text = gen.networks_text()
+        prefix = text[:text.rfind('\n', 0, rng.randrange(len(text) + 1)) + 1]
+        # A BSSID is complete once its channel line (the last one parsed) is in
+        complete = sum(1 for line in prefix.split('\r\n')
+                       if line.lstrip().startswith(gen.labels['channel'] + ' '))
+        assert extract(prefix) == expected(gen.records())[:complete]
+
+
+def test_signal_never_paired_with_another_bssids_channel():
+    for rng, gen in generators():
+        records = gen.records()
+        missing = set(rng.sample(range(len(records)), rng.randint(1, len(records))))
+        out, b = [], -1
+        for line in gen.networks_text().split('\r\n'):
+            if line.lstrip().startswith(gen.labels['bssid'] + ' '):
+                b += 1
+            if line.lstrip().startswith(gen.labels['channel'] + ' ') and b in missing:
+                continue
+            out.append(line)
+        assert extract('\r\n'.join(out)) == [e for i, e in enumerate(expected(records)) if i not in missing]
+
+
+def test_mutated_output_never_raises():
+    for rng, gen in generators():
+        lines = gen.networks_text().split('\r\n')
+        for _ in range(rng.randint(1, 4)):
+            lines = mutate(rng, lines)
+        result = extract(rng.choice(['\r\n', '\n', '\r']).join(lines))
+        assert all(isinstance(s, str) and isinstance(p, int) and isinstance(c, int) for s, p, c in result)
+
+
+@pytest.mark.parametrize('name', sorted(ADVERSARIAL))
+def test_linear_time(name):
+    make = ADVERSARIAL[name]
+    small, large = (min(_time(make(n)) for _ in range(3)) for n in (500, 8000))
+    assert large <= max(small, 1e-4) * 16 * 3, f"{small * 1000:.2f} ms -> {large * 1000:.2f} ms for 16x input"
@@ -1,13 +1,14 @@
 import subprocess
 import re
 import platform
+from wifimon.scan import decode_output
 import time
 
 def read_data_from_cmd ( ) :
 
     p = subprocess.Popen("netsh wlan show interfaces", stdout=subprocess.PIPE,
     stderr=subprocess.PIPE)
-    out = p.stdout.read().decode('unicode_escape').strip()
+    out = decode_output(p.stdout.read()).strip()
     p.communicate()
     #print(out)
     return out
@@ -1,6 +1,8 @@
 import subprocess
 import re
 import platform
+from wifimon.scan import decode_output
+from wifimon.downsample import lttb, pixel_budget
 from datetime import datetime
 from matplotlib.animation import FuncAnimation
 from matplotlib import pyplot
@@ -9,7 +11,7 @@ def read_data_from_cmd ( ) :
 
     p = subprocess.Popen("netsh wlan show interfaces", stdout=subprocess.PIPE,
     stderr=subprocess.PIPE)
-    out = p.stdout.read().decode('unicode_escape').strip()
+    out = decode_output(p.stdout.read()).strip()
     #print(out)
     if platform.system() == 'Windows':
         m = re.findall('Name.*?:.*?([A-z0-9 ]*).*?Signal.*?:.*?([0-9]*)%',out,re.DOTALL)
@@ -36,7 +38,8 @@ def update(frame):
     difference = (datetime.now() - start).total_seconds()
     x_data.append(difference)
     y_data.append(int(read_data_from_cmd()[0][1]))
-    line.set_data(x_data,y_data)
+    # tout l'historique, réduit à un point par pixel de l'axe (LTTB)
+    line.set_data(*lttb(x_data, y_data, pixel_budget(figure.gca())))
     figure.gca().relim()
     figure.gca().autoscale_view()
     text_label.set_text(f"Puissance actuelle : {y_data[-1]}")
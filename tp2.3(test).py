@@ -1,42 +1,30 @@
 import subprocess
-import re
 import platform
 from datetime import datetime
-from matplotlib.animation import FuncAnimation
 from matplotlib import pyplot as plt
 import collections
 import numpy as np
-from scipy.stats import norm
 import matplotlib.patches as patches
+from wifimon.parser import parse_networks, parse_interfaces, signals_by_ssid, connected_wifi
+from wifimon.scan import decode_output
+from wifimon.sampler import Sampler
+from wifimon.store import SeriesStore, NETWORK_TTL, MAX_NETWORKS
+from wifimon.stats import SlidingStats
+from wifimon.topk import TopK
+from wifimon.gaussian import GaussianCurves, peak_normalized_at
 
 
 def scan_available_wifis():
     """Scan for all available WiFi networks"""
     try:
         cmd = "netsh wlan show networks mode=bssid"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=15, encoding='utf-8')
+        result = subprocess.run(cmd, shell=True, capture_output=True, timeout=15)
 
         networks = {}
-        current_ssid = None
 
         if result.returncode == 0:
-            lines = result.stdout.split('\n')
-
-            for line in lines:
-                line = line.strip()
-
-                # SSID detection
-                ssid_match = re.match(r'SSID\s*\d+\s*:\s*(.+)', line, re.IGNORECASE)
-                if ssid_match:
-                    current_ssid = ssid_match.group(1).strip()
-                    if current_ssid not in networks:
-                        networks[current_ssid] = []
-
-                # Signal detection
-                signal_match = re.search(r'Signal\s*:\s*(\d+)%', line, re.IGNORECASE)
-                if signal_match and current_ssid:
-                    signal_strength = int(signal_match.group(1))
-                    networks[current_ssid].append(signal_strength)
+            # Every BSSID signal, grouped by SSID
+            networks = signals_by_ssid(parse_networks(decode_output(result.stdout)))
 
         return networks
 
@@ -49,22 +37,13 @@ def get_connected_wifi():
     """Get connected WiFi information"""
     try:
         cmd = "netsh wlan show interfaces"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=5, encoding='utf-8')
+        result = subprocess.run(cmd, shell=True, capture_output=True, timeout=5)
 
         ssid = None
         signal = None
 
         if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                line = line.strip()
-                if 'SSID' in line and 'BSSID' not in line:
-                    ssid_match = re.search(r'SSID\s*:\s*(.+)', line)
-                    if ssid_match:
-                        ssid = ssid_match.group(1).strip()
-                elif 'Signal' in line:
-                    signal_match = re.search(r'(\d+)%', line)
-                    if signal_match:
-                        signal = int(signal_match.group(1))
+            ssid, signal = connected_wifi(parse_interfaces(decode_output(result.stdout)))
 
         return ssid, signal
 
@@ -74,8 +53,24 @@ def get_connected_wifi():
 
 
 # Data storage
-wifi_data = collections.defaultdict(lambda: {'signals': [], 'timestamps': [], 'gaussian_params': None})
+signal_stats = collections.defaultdict(lambda: SlidingStats(window=100))  # O(1) mean/std per sample
+gaussian_params = {}
+latest_ranking = TopK(0, 100)  # SSIDs by latest signal
+mean_ranking = TopK(0, 100)  # SSIDs with a Gaussian model, by mean signal
+
+
+def forget_network(ssid):
+    """Drop the statistics of a network evicted from wifi_data"""
+    signal_stats.pop(ssid, None)
+    gaussian_params.pop(ssid, None)
+    latest_ranking.discard(ssid)
+    mean_ranking.discard(ssid)
+
+
+wifi_data = SeriesStore(capacity=100,  # last 100 measurements per SSID, preallocated
+                        ttl=NETWORK_TTL, max_keys=MAX_NETWORKS, on_evict=forget_network)
 start_time = datetime.now()
+start_ms = int(start_time.timestamp() * 1000)
 
 # Create figure with subplots
 print("Setting up WiFi Gaussian distribution monitoring...")
@@ -91,45 +86,52 @@ plt.tight_layout(pad=4.0)
 # Color setup
 colors = plt.cm.Set3(np.linspace(0, 1, 12))
 
+# Peak-normalized Gaussian curves, reused while (mean, std) stay within 0.1
+gaussian_curves = GaussianCurves(0, 100, 200, resolution=0.1)
 
-def create_gaussian_distribution(signals):
-    """Create Gaussian distribution from signal strength data"""
-    if len(signals) < 2:
+
+def create_gaussian_distribution(stats):
+    """Create Gaussian distribution from the sliding-window signal statistics"""
+    if len(stats) < 2:
         # If not enough data, create a default distribution
-        mean = signals[0] if signals else 50
+        mean = stats.mean if len(stats) else 50
         std = 10
     else:
-        mean = np.mean(signals)
-        std = np.std(signals)
+        mean, std = stats.mean_std()
         # Ensure minimum standard deviation for visibility
         std = max(std, 5)
 
     return mean, std
 
 
-def update(frame):
+def update():
     try:
-        current_time = (datetime.now() - start_time).total_seconds()
-
-        # Scan for networks
-        networks = scan_available_wifis()
-        connected_ssid, connected_signal = get_connected_wifi()
+        # Scans run on the sampler thread; only draw what it has collected so far
+        samples = sampler.buffer.drain()
+        if not samples:
+            return
 
         # Update data for all networks
-        for ssid, signals in networks.items():
-            if signals:
-                wifi_data[ssid]['signals'].extend(signals)
-                wifi_data[ssid]['timestamps'].extend([current_time] * len(signals))
-
-                # Keep last 100 measurements
-                if len(wifi_data[ssid]['signals']) > 100:
-                    wifi_data[ssid]['signals'] = wifi_data[ssid]['signals'][-100:]
-                    wifi_data[ssid]['timestamps'] = wifi_data[ssid]['timestamps'][-100:]
-
-                # Update Gaussian parameters
-                if len(wifi_data[ssid]['signals']) >= 2:
-                    mean, std = create_gaussian_distribution(wifi_data[ssid]['signals'])
-                    wifi_data[ssid]['gaussian_params'] = (mean, std)
+        updated = set()
+        for sample in samples:
+            sample_ms = int(sample.time * 1000)
+            for ssid, signals in sample.networks.items():
+                if signals:
+                    wifi_data.extend(ssid, sample_ms, signals)
+                    signal_stats[ssid].extend(signals)
+                    latest_ranking.update(ssid, signals[-1])
+                    updated.add(ssid)
+
+        # Update Gaussian parameters
+        for ssid in updated:
+            if ssid in wifi_data and len(wifi_data[ssid]) >= 2:  # may have been evicted since
+                gaussian_params[ssid] = create_gaussian_distribution(signal_stats[ssid])
+                mean_ranking.update(ssid, gaussian_params[ssid][0])
+
+        latest = samples[-1]
+        current_time = latest.time - start_time.timestamp()
+        networks = latest.networks
+        connected_ssid, connected_signal = latest.connected_ssid, latest.connected_signal
 
         # Clear plots
         ax1.clear()
@@ -158,15 +160,12 @@ def update(frame):
         ax3.grid(True, alpha=0.3)
 
         # Plot real-time data (top-left)
-        sorted_networks = sorted([(ssid, data) for ssid, data in wifi_data.items()
-                                  if data['signals']],
-                                 key=lambda x: x[1]['signals'][-1] if x[1]['signals'] else 0,
-                                 reverse=True)
+        strongest = [(ssid, wifi_data[ssid]) for ssid in latest_ranking.top(6)]
 
-        for i, (ssid, data) in enumerate(sorted_networks[:6]):  # Top 6 networks
-            if data['timestamps'] and data['signals']:
+        for i, (ssid, data) in enumerate(strongest):  # Top 6 networks
+            if len(data):
                 color = colors[i % len(colors)]
-                ax1.plot(data['timestamps'], data['signals'], 'o-',
+                ax1.plot((data.times() - start_ms) / 1000, data.values(), 'o-',
                          linewidth=1.5, markersize=3, color=color,
                          label=f"{ssid[:12]}..." if len(ssid) > 12 else ssid,
                          alpha=0.7)
@@ -174,22 +173,17 @@ def update(frame):
         ax1.legend(fontsize=8, loc='upper right')
 
         # Plot Gaussian distributions (top-right)
-        networks_with_gaussian = [(ssid, data) for ssid, data in wifi_data.items()
-                                  if data['gaussian_params'] is not None]
-
-        # Sort by mean signal strength (strongest first)
-        networks_with_gaussian.sort(key=lambda x: x[1]['gaussian_params'][0], reverse=True)
+        # Strongest mean signal first
+        networks_with_gaussian = [(ssid, wifi_data[ssid]) for ssid in mean_ranking.top(8)]
 
-        x_plot = np.linspace(0, 100, 200)
+        x_plot = gaussian_curves.x
 
-        for i, (ssid, data) in enumerate(networks_with_gaussian[:8]):  # Top 8 distributions
-            mean, std = data['gaussian_params']
+        for i, (ssid, data) in enumerate(networks_with_gaussian):  # Top 8 distributions
+            mean, std = gaussian_params[ssid]
             color = colors[i % len(colors)]
 
-            # Create Gaussian curve
-            y_plot = norm.pdf(x_plot, mean, std)
-            # Normalize for better visualization
-            y_plot = y_plot / np.max(y_plot) * 0.8
+            # Cached Gaussian curve, normalized for better visualization
+            y_plot = gaussian_curves.curve(mean, std) * 0.8
 
             ax2.plot(x_plot, y_plot, '-', linewidth=2, color=color,
                      label=f"{ssid[:10]}... (μ={mean:.1f}%, σ={std:.1f})")
@@ -201,9 +195,9 @@ def update(frame):
             ax2.axvline(x=mean, color=color, linestyle='--', alpha=0.5)
 
             # Add current signal strength as a point
-            if data['signals']:
-                current_signal = data['signals'][-1]
-                y_current = norm.pdf(current_signal, mean, std) / np.max(norm.pdf(x_plot, mean, std)) * 0.8
+            if len(data):
+                current_signal = data.last()[1]
+                y_current = peak_normalized_at(current_signal, mean, std) * 0.8
                 ax2.plot(current_signal, y_current, 'o', markersize=6,
                          color=color, markeredgecolor='black', markeredgewidth=1)
 
@@ -213,24 +207,22 @@ def update(frame):
         if connected_ssid and connected_ssid in wifi_data:
             connected_data = wifi_data[connected_ssid]
 
-            if connected_data['gaussian_params']:
-                mean, std = connected_data['gaussian_params']
+            if connected_ssid in gaussian_params:
+                mean, std = gaussian_params[connected_ssid]
 
                 # Main Gaussian curve
-                x_detailed = np.linspace(max(0, mean - 3 * std), min(100, mean + 3 * std), 200)
-                y_detailed = norm.pdf(x_detailed, mean, std)
-                y_detailed = y_detailed / np.max(y_detailed)  # Normalize
+                x_detailed, y_detailed = gaussian_curves.detailed(mean, std, width=3)  # Normalized
 
                 ax3.plot(x_detailed, y_detailed, 'b-', linewidth=3,
                          label=f'Gaussian Distribution (μ={mean:.1f}%, σ={std:.1f})')
                 ax3.fill_between(x_detailed, 0, y_detailed, alpha=0.3, color='blue')
 
                 # Current signal strength
-                if connected_data['signals']:
-                    current_signal = connected_data['signals'][-1]
-                    y_current = norm.pdf(current_signal, mean, std) / np.max(norm.pdf(x_detailed, mean, std))
+                if len(connected_data):
+                    current_signal = connected_data.last()[1]
+                    y_current = peak_normalized_at(current_signal, mean, std)
                     ax3.plot(current_signal, y_current, 'ro', markersize=10,
-                             label=f'Current: {current_signal}%')
+                             label=f'Current: {current_signal:.0f}%')
 
                 # Signal quality zones
                 zones = [
@@ -248,10 +240,10 @@ def update(frame):
                 # Statistics
                 stats_text = f"""
                 Connected: {connected_ssid}
-                Current: {current_signal}%
+                Current: {current_signal:.0f}%
                 Mean (μ): {mean:.1f}%
                 Std Dev (σ): {std:.1f}%
-                Samples: {len(connected_data['signals'])}
+                Samples: {len(connected_data)}
                 Reliability: {'High' if std < 15 else 'Medium' if std < 25 else 'Low'}
                 """
 
@@ -266,16 +258,15 @@ def update(frame):
         ax1.set_xlim(max(0, current_time - time_window), current_time + 5)
 
         plt.tight_layout(pad=4.0)
+        fig.canvas.draw_idle()  # only frames with new samples are redrawn
 
-        print(f"Update: {len(networks)} networks, {len(networks_with_gaussian)} with Gaussian models")
+        print(f"Update: {len(networks)} networks, {len(gaussian_params)} with Gaussian models")
 
     except Exception as e:
         print(f"Update error: {e}")
         import traceback
         traceback.print_exc()
 
-    return []
-
 
 print("\nStarting WiFi Gaussian Distribution Monitoring...")
 print("This will show:")
@@ -283,5 +274,9 @@ print("1. Real-time signal strength over time")
 print("2. Gaussian distributions for each WiFi network")
 print("3. Detailed analysis of connected network")
 
-animation = FuncAnimation(fig, update, interval=3000, cache_frame_data=False, blit=False)
+sampler = Sampler(scan_available_wifis, get_connected_wifi, interval=3).start()
+# A canvas timer rather than FuncAnimation, which would redraw the whole figure every tick
+timer = fig.canvas.new_timer(interval=1000)
+timer.add_callback(update)
+timer.start()
 plt.show()
\ No newline at end of file
@@ -1,9 +1,12 @@
 import subprocess
-import re
 import platform
-import numpy as np
 from matplotlib.animation import FuncAnimation
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from wifimon.spectrum import SpectrumEngine
+from wifimon.scan import decode_output
+from wifimon.parser import iter_networks
 
 # ────────────────────────────────────────────────
 # 🔹 Lecture des réseaux Wi-Fi visibles
@@ -13,47 +16,31 @@ def read_networks_from_cmd():
         raise Exception("⚠️ Ce script ne fonctionne que sur Windows.")
 
     try:
-        # Lecture avec encodage Windows (plus fiable que unicode_escape)
-        out = subprocess.check_output(
+        # Octets bruts, décodés avec la page de code de la console (détectée une seule fois)
+        text = decode_output(subprocess.check_output(
             ["netsh", "wlan", "show", "networks", "mode=bssid"],
-            shell=True,
-            encoding="utf-8",
-            errors="ignore"
-        )
-    except Exception:
-        # Si utf-8 échoue, on retente avec un autre encodage courant
-        out = subprocess.check_output(
-            ["netsh", "wlan", "show", "networks", "mode=bssid"],
-            shell=True,
-            encoding="cp1252",
-            errors="ignore"
-        )
+            shell=True
+        ))
+    except subprocess.CalledProcessError:
+        # Pas de second lancement : la trame suivante réessaiera
+        return []
 
-    # Nettoyage des caractères parasites
-    text = out.replace("Â", "").replace("", "").replace("\r", "")
+    return extract_networks(text)
 
-    # Expression régulière pour SSID, Signal, Canal (FR + EN)
-    pattern = r"(?:SSID\s*\d*\s*:\s*|Nom du réseau\s*:\s*)(.*?)\s*(?:.*?\n){0,6}.*?(?:Signal\s*:\s*|Strength\s*:\s*)(\d+)%.*?(?:Canal\s*:\s*|Channel\s*:\s*)(\d+)"
-    matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
 
+def extract_networks(text):
+    # Liste (ssid, signal %, canal) : une entrée par BSSID, en temps linéaire.
+    # Analyse ligne par ligne (wifimon.parser), sans retour arrière : une sortie
+    # tronquée ou malformée ne peut plus bloquer l'animation, et un signal
+    # n'est jamais associé au canal d'un autre réseau (BSSID incomplets ignorés).
     networks = []
-    for ssid, signal, channel in matches:
-        ssid = ssid.strip() or "(hidden)"
-        try:
-            networks.append((ssid, int(signal), int(channel)))
-        except ValueError:
+    for rec in iter_networks(text):
+        if rec.signal is None or rec.channel is None:
             continue
-
+        networks.append((rec.ssid or "(hidden)", rec.signal, rec.channel))
     return networks
 
 
-# ────────────────────────────────────────────────
-# 🔹 Fonction gaussienne (modélisation bande passante)
-# ────────────────────────────────────────────────
-def gaussian(x, mu, amplitude, sigma=1.5):
-    return amplitude * np.exp(-0.5 * ((x - mu) / sigma) ** 2)
-
-
 # ────────────────────────────────────────────────
 # 🔹 Préparation du graphique
 # ────────────────────────────────────────────────
@@ -66,30 +53,43 @@ ax.set_title("Spectre Wi-Fi en temps réel")
 ax.grid(True, linestyle="--", alpha=0.4)
 
 
+# ────────────────────────────────────────────────
+# 🔹 Artistes persistants : une seule LineCollection pour toutes les gaussiennes
+#    (modélisation bande passante, sigma = 1.5 canal)
+# ────────────────────────────────────────────────
+spectre = SpectrumEngine(1, 13, 400)
+courbes = LineCollection([], linewidths=2)
+ax.add_collection(courbes)
+message = ax.text(6, 50, "⚠️ Aucun réseau Wi-Fi détecté", ha="center", va="center", color="red", fontsize=12)
+message.set_visible(False)
+couleurs = plt.cm.tab20.colors
+MAX_LEGENDE = 10  # au-delà, la légende devient illisible et coûteuse
+
+
 # ────────────────────────────────────────────────
 # 🔹 Mise à jour du graphique en temps réel
 # ────────────────────────────────────────────────
 def update(frame):
-    ax.clear()
-    ax.set_xlim(1, 13)
-    ax.set_ylim(0, 100)
-    ax.set_xlabel("Canal Wi-Fi (2.4 GHz)")
-    ax.set_ylabel("Puissance du signal (%)")
-    ax.set_title("Spectre Wi-Fi en temps réel")
-    ax.grid(True, linestyle="--", alpha=0.4)
-
     networks = read_networks_from_cmd()
 
+    message.set_visible(not networks)
     if not networks:
-        ax.text(6, 50, "⚠️ Aucun réseau Wi-Fi détecté", ha="center", va="center", color="red", fontsize=12)
+        courbes.set_segments([])
+        legende = ax.get_legend()
+        if legende is not None:
+            legende.remove()
         return []
 
-    x = np.linspace(1, 13, 400)
-    for ssid, signal, channel in networks:
-        y = gaussian(x, channel, signal)
-        ax.plot(x, y, linewidth=2, label=f"{ssid} ({signal}%)")
+    # Toutes les gaussiennes en une seule opération (N réseaux × 400 points)
+    ssids, signals, channels = zip(*networks)
+    courbes.set_segments(spectre.segments(channels, signals))
+    courbes.set_color([couleurs[i % len(couleurs)] for i in range(len(networks))])
 
-    ax.legend(loc="upper right", fontsize=8)
+    # Légende limitée aux réseaux les plus forts
+    plus_forts = sorted(range(len(networks)), key=lambda i: signals[i], reverse=True)[:MAX_LEGENDE]
+    poignees = [Line2D([], [], linewidth=2, color=couleurs[i % len(couleurs)],
+                       label=f"{ssids[i]} ({signals[i]}%)") for i in plus_forts]
+    ax.legend(handles=poignees, loc="upper right", fontsize=8)
     return []
 
 
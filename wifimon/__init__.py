@@ -0,0 +1 @@
+"""Shared helpers for the WiFi data collection scripts"""
@@ -0,0 +1,5 @@
+import sys
+
+from wifimon.cli import main
+
+sys.exit(main())
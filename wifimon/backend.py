@@ -0,0 +1,64 @@
+"""Scan backends: one interface, netsh (Windows) and Linux implementations"""
+
+import sys
+
+from wifimon.scan import run_command, scan_networks, scan_interfaces
+
+BACKENDS = ('auto', 'netsh', 'linux')
+
+
+class Backend:
+    """Source of scan results
+
+    networks() returns BssidRecord lists and interfaces() InterfaceRecord
+    lists, with signal in % like netsh. link() is the cheap per-sample path
+    (connected interface only); backends override it when they can do
+    better than a full interfaces() call.
+    """
+
+    name = 'base'
+
+    def networks(self):
+        raise NotImplementedError
+
+    def interfaces(self):
+        raise NotImplementedError
+
+    def link(self):
+        """InterfaceRecord of the first connected interface, or None"""
+        for iface in self.interfaces():
+            if iface.ssid:
+                return iface
+        return None
+
+
+class NetshBackend(Backend):
+    """`netsh wlan show ...` (one process per call)"""
+
+    name = 'netsh'
+
+    def __init__(self, timeout=15, run=run_command):
+        self.timeout = timeout
+        self.run = run
+
+    def networks(self):
+        return scan_networks(self.timeout, self.run)
+
+    def interfaces(self):
+        return scan_interfaces(min(self.timeout, 10), self.run)
+
+
+def get_backend(name='auto', run=run_command):
+    """Backend instance by name ('auto' picks the one for this platform)
+
+    `run(cmd, timeout)` runs the backend's commands (run_command, or
+    PersistentShell.output to avoid one process spawn per command).
+    """
+    if name == 'auto':
+        name = 'netsh' if sys.platform == 'win32' else 'linux'
+    if name == 'netsh':
+        return NetshBackend(run=run)
+    if name == 'linux':
+        from wifimon.linux import LinuxBackend
+        return LinuxBackend(run=run)
+    raise ValueError(f"unknown backend: {name}")
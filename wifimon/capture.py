@@ -0,0 +1,100 @@
+"""Opt-in archive of raw scan outputs, compressed and written off the scan path"""
+
+import atexit
+import gzip
+import os
+import queue
+import threading
+import time
+
+from wifimon.collector import rotate
+
+
+class CaptureArchive:
+    """Append raw command outputs with timestamps to a size-capped gzip log
+
+    record() only queues the text; compression and disk I/O happen on a
+    daemon thread. An output identical to the previous one is skipped, and
+    once the compressed file passes max_bytes it is rotated to path.1 ...
+    path.N. Each record is a `# capture <time> <nbytes> <source>` line
+    followed by the output itself (see iter_captures).
+    """
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=2, queue_size=64):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.written = 0
+        self.skipped = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name='wifi-capture', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, text, source=''):
+        """Queue one raw output; never blocks (drops it when the writer is behind)"""
+        try:
+            self._queue.put_nowait((time.time(), source, text))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Write what is still queued and close the file"""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+    def _run(self):
+        raw = gz = None
+        last = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            t, source, text = item
+            if text == last:
+                self.skipped += 1
+                continue
+            last = text
+            try:
+                if gz is None:
+                    raw = open(self.path, 'ab')
+                    gz = gzip.GzipFile(fileobj=raw, mode='ab')
+                data = text.encode('utf-8')
+                gz.write(f"# capture {t:.3f} {len(data)} {source}\n".encode('utf-8') + data + b"\n")
+                self.written += 1
+                if self._queue.empty():
+                    gz.flush()  # sync point, so a crash keeps everything written so far
+                if self.max_bytes and raw.tell() > self.max_bytes:
+                    gz.close()
+                    raw.close()
+                    raw = gz = None
+                    rotate(self.path, self.backups)
+            except OSError as e:
+                print(f"Capture error: {e}")
+                raw = gz = None
+        if gz is not None:
+            gz.close()
+            raw.close()
+
+
+def iter_captures(path):
+    """Yield (time, source, text) for every record of a capture file"""
+    if not os.path.exists(path):
+        return
+    with gzip.open(path, 'rb') as f:
+        while True:
+            try:
+                header = f.readline()
+                if not header:
+                    return
+                _, _, t, n, source = header.decode('utf-8').rstrip('\n').split(' ', 4)
+                data = f.read(int(n))
+                f.read(1)
+            except EOFError:
+                return  # last member cut short (writer killed mid-flush)
+            yield float(t), source, data.decode('utf-8')
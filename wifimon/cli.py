@@ -0,0 +1,283 @@
+"""Single entry point for the collection scripts
+
+    python -m wifimon collect              # tp 2.1.py, headless (netsh or Linux backend)
+    python -m wifimon daemon -o FILE       # scheduled scans to a rotating CSV
+    python -m wifimon live                 # tp2.2 (connected network signal)
+    python -m wifimon spectrum             # tp2.3.py
+    python -m wifimon gaussian             # tp2.3(test).py
+    python -m wifimon dual [--units ...]   # ex3.py (dBm) / test.py (%)
+    python -m wifimon replay FRONTEND -i F # recorded scans through a frontend, headless
+
+Heavy modules (matplotlib, numpy) are only imported by the subcommand that
+draws, so headless collection starts without paying for them.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+_T0 = time.perf_counter()
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# subcommand -> script it runs (the scripts keep their module-level setup)
+FRONTENDS = {
+    'live': 'tp2.2 affichage graphique wifi connecté.py',
+    'spectrum': 'tp2.3.py',
+    'gaussian': 'tp2.3(test).py',
+    'dual': {'dbm': 'ex3.py', 'percent': 'test.py'},
+}
+
+# Modules each plotting frontend pulls in at import time
+GUI_MODULES = ('numpy', 'matplotlib.pyplot', 'matplotlib.animation')
+
+DEFAULT_BUDGETS = {'collect': 0.5, 'daemon': 0.5}
+GUI_BUDGET = 5.0
+
+
+def check_import_budget(command, budget):
+    """Warn on stderr when the imports for `command` took longer than budget seconds"""
+    elapsed = time.perf_counter() - _T0
+    if budget is not None and elapsed > budget:
+        print(f"warning: '{command}' imports took {elapsed:.2f}s (budget {budget:.2f}s)",
+              file=sys.stderr)
+    return elapsed
+
+
+def _command_runner(args):
+    """run(cmd, timeout) for the backend: one shell kept open with --shell"""
+    if args.shell:
+        from wifimon.shell import PersistentShell
+        return PersistentShell().output
+    from wifimon.scan import run_command
+    return run_command
+
+
+# ----------------- Subcommands -----------------
+
+
+def cmd_collect(args):
+    """Print the connected network signal every interval (tp 2.1.py)"""
+    from wifimon.backend import get_backend
+
+    backend = get_backend(args.backend, run=_command_runner(args))
+    check_import_budget('collect', args.import_budget)
+    n = 0
+    while True:
+        link = backend.link()
+        if link is None:
+            print([])
+        elif args.rssi:
+            print([(link.ssid, link.rssi)])
+        else:
+            print([(link.ssid, f"{link.signal}%")])
+        n += 1
+        if args.count and n >= args.count:
+            return 0
+        time.sleep(args.interval)
+
+
+def cmd_daemon(args):
+    """Write scan + connected samples to a rotating CSV file, without any GUI"""
+    import signal
+    import threading
+    from wifimon.backend import get_backend
+    from wifimon.collector import RotatingWriter, csv_header, run_collector
+
+    backend = get_backend(args.backend, run=_command_runner(args))
+    check_import_budget('daemon', args.import_budget)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    writer = RotatingWriter(args.output, max_bytes=args.max_bytes, backups=args.backups,
+                            header=csv_header())
+    log = db = None
+    if args.log:
+        from wifimon.samplelog import SampleLog
+        log = SampleLog(args.log)
+    if args.db:
+        from wifimon.database import SqliteSink
+        db = SqliteSink(args.db)
+    try:
+        run_collector(writer, interval=args.interval, duration=args.duration,
+                      count=args.count, stop=stop, scan=backend.networks,
+                      interfaces=backend.interfaces, log=log, db=db)
+    finally:
+        writer.close()
+        if log is not None:
+            log.close()
+        if db is not None:
+            db.close()
+    return 0
+
+
+def _enable_profiling(args):
+    """Switch the stage profiler on for --profile (before the script runs)"""
+    if not getattr(args, 'profile', False):
+        return
+    from wifimon.timing import profiler
+    profiler.configure(report_every=args.profile_every, output=args.profile_file)
+
+
+def _configure_tracking(args):
+    """--ttl / --max-networks / --top: limits the scripts read from wifimon.store / wifimon.topk"""
+    import wifimon.store
+    import wifimon.topk
+
+    if getattr(args, 'ttl', None) is not None:
+        wifimon.store.NETWORK_TTL = args.ttl
+    if getattr(args, 'max_networks', None) is not None:
+        wifimon.store.MAX_NETWORKS = args.max_networks
+    if getattr(args, 'top', None) is not None:
+        wifimon.topk.TOP_NETWORKS = args.top
+
+
+def cmd_frontend(args):
+    """Run one of the plotting scripts"""
+    import importlib
+    import runpy
+
+    if getattr(args, 'units', None) == 'dbm' and (args.capture or args.db):
+        print("error: --capture and --db need --units percent (the dBm view records nothing)",
+              file=sys.stderr)
+        return 2
+    for name in GUI_MODULES:
+        importlib.import_module(name)
+    check_import_budget(args.command, args.import_budget)
+
+    if getattr(args, 'capture', None):
+        os.environ['WIFIMON_CAPTURE'] = args.capture
+    if getattr(args, 'db', None):
+        os.environ['WIFIMON_DB'] = args.db
+    _enable_profiling(args)
+    _configure_tracking(args)
+    script = FRONTENDS[args.command]
+    if isinstance(script, dict):
+        script = script[args.units]
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    runpy.run_path(os.path.join(REPO_DIR, script), run_name='__main__')
+    return 0
+
+
+def cmd_replay(args):
+    """Play a recording through a plotting script (headless) and report its frame rate"""
+    from wifimon.replay import ReplaySource, load_recording, run_frontend
+
+    check_import_budget('replay', args.import_budget)
+    if args.synthetic:
+        from wifimon.synth import NetshGenerator
+        records = NetshGenerator(args.synthetic, seed=0).recording(steps=120)
+    else:
+        records = load_recording(args.input)
+    source = ReplaySource(records, speed=args.speed, loop=not args.no_loop)
+    _enable_profiling(args)
+    _configure_tracking(args)
+    script = FRONTENDS[args.frontend]
+    if isinstance(script, dict):
+        script = script[args.units]
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    report = run_frontend(os.path.join(REPO_DIR, script), source, frames=args.frames,
+                          pace=not args.unpaced)
+    print(f"{args.frontend}: {report.frames} frames in {report.elapsed:.2f}s "
+          f"({report.fps:.1f} fps), latency p50 {report.p50_ms:.1f} ms, "
+          f"p95 {report.p95_ms:.1f} ms, max {report.max_ms:.1f} ms, {report.full_draws} full redraws, "
+          f"{report.scans} scans served")
+    return 0
+
+
+def build_parser():
+    from wifimon.backend import BACKENDS
+
+    parser = argparse.ArgumentParser(prog='wifimon', description='WiFi data collection and live plots')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('collect', help='print the connected network signal (no GUI)')
+    p.add_argument('--interval', type=float, default=1.0, help='seconds between samples')
+    p.add_argument('--count', type=int, default=0, help='stop after N samples (0 = forever)')
+    p.add_argument('--rssi', action='store_true', help='print RSSI (dBm) instead of signal %%')
+    p.add_argument('--backend', choices=BACKENDS, default='auto', help='scan backend')
+    p.add_argument('--shell', action='store_true',
+                   help='run scan commands in one persistent shell instead of a process each')
+    p.set_defaults(func=cmd_collect)
+
+    p = sub.add_parser('daemon', help='scheduled scans to a rotating CSV file (no GUI)')
+    p.add_argument('-o', '--output', default='wifi_samples.csv', help='output file')
+    p.add_argument('--interval', type=float, default=5.0, help='seconds between scans')
+    p.add_argument('--duration', type=float, default=None, help='stop after SEC seconds')
+    p.add_argument('--count', type=int, default=None, help='stop after N scans')
+    p.add_argument('--max-bytes', type=int, default=10 * 1024 * 1024,
+                   help='rotate the output file past this size (0 = never)')
+    p.add_argument('--backups', type=int, default=5, help='rotated files to keep')
+    p.add_argument('--log', metavar='FILE',
+                   help='also append every sample to a binary sample log (wifimon.samplelog)')
+    p.add_argument('--db', metavar='FILE',
+                   help='also insert every sample into an SQLite database (wifimon.database)')
+    p.add_argument('--backend', choices=BACKENDS, default='auto', help='scan backend')
+    p.add_argument('--shell', action='store_true',
+                   help='run scan commands in one persistent shell instead of a process each')
+    p.set_defaults(func=cmd_daemon)
+
+    helps = {
+        'live': 'live plot of the connected network signal',
+        'spectrum': 'channel spectrum of visible networks',
+        'gaussian': 'signal distributions (Gaussian models)',
+        'dual': 'available + connected networks over time',
+    }
+    for name, text in helps.items():
+        p = sub.add_parser(name, help=text)
+        if name == 'dual':
+            p.add_argument('--units', choices=('dbm', 'percent'), default='dbm')
+            p.add_argument('--capture', metavar='FILE',
+                           help='archive raw netsh outputs to a gzip file (needs --units percent)')
+            p.add_argument('--db', metavar='FILE',
+                           help='insert every sample into an SQLite database (needs --units percent)')
+        p.set_defaults(func=cmd_frontend)
+
+    p = sub.add_parser('replay', help='play recorded scans through a plotting frontend (headless)')
+    p.add_argument('frontend', choices=list(helps))
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument('-i', '--input', help='capture archive (.gz) or daemon CSV')
+    group.add_argument('--synthetic', type=int, metavar='N',
+                       help='generated netsh output with N drifting BSSIDs instead')
+    p.add_argument('--units', choices=('dbm', 'percent'), default='dbm', help='for dual')
+    p.add_argument('--speed', type=float, default=1.0, help='playback speed (x recorded pace)')
+    p.add_argument('--frames', type=int, default=100, help='animation ticks to time')
+    p.add_argument('--unpaced', action='store_true', help='run frames back to back')
+    p.add_argument('--no-loop', action='store_true', help='hold the last record instead of looping')
+    p.set_defaults(func=cmd_replay)
+
+    for name in ('gaussian', 'dual', 'replay'):
+        p = sub.choices[name]
+        p.add_argument('--ttl', type=float, metavar='SEC',
+                       help='forget networks not seen for SEC seconds (default 600, 0 = never)')
+        p.add_argument('--max-networks', type=int, metavar='N',
+                       help='track at most N networks, dropping the least recently seen (default 1024)')
+
+    for name in ('dual', 'replay'):
+        sub.choices[name].add_argument('--top', type=int, metavar='N',
+                                       help='plot the N strongest networks (default 32, 8 labelled)')
+
+    for name in ('dual', 'replay'):
+        p = sub.choices[name]
+        p.add_argument('--profile', action='store_true',
+                       help='time the scan / update stages and report p50/p95/p99 latencies')
+        p.add_argument('--profile-every', type=float, default=10.0, metavar='SEC',
+                       help='seconds between profile reports')
+        p.add_argument('--profile-file', metavar='FILE',
+                       help='write the profile as JSON to FILE instead of stderr')
+
+    for p in sub.choices.values():
+        p.add_argument('--import-budget', type=float, metavar='SEC',
+                       default=DEFAULT_BUDGETS.get(p.prog.split()[-1], GUI_BUDGET),
+                       help='warn when startup imports exceed SEC seconds')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
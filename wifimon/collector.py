@@ -0,0 +1,131 @@
+"""Headless collection: scheduled scans written to a size-rotated CSV file"""
+
+import csv
+import io
+import os
+import threading
+import time
+
+from wifimon.scan import scan_networks, scan_interfaces
+
+FIELDS = ['timestamp', 'kind', 'ssid', 'bssid', 'signal', 'channel', 'radio_type', 'band']
+
+
+def rotate(path, backups):
+    """Shift path -> path.1 -> ... -> path.N, dropping the oldest (removes path when backups is 0)"""
+    if backups > 0:
+        for i in range(backups - 1, 0, -1):
+            src = f"{path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{path}.{i + 1}")
+        os.replace(path, f"{path}.1")
+    else:
+        os.remove(path)
+
+
+class RotatingWriter:
+    """Append text lines to path, rotating to path.1 ... path.N past max_bytes
+
+    `header` is written at the top of every new file.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backups=5, header=''):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.header = header
+        self._file = None
+        self._size = 0
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, 'a', encoding='utf-8', newline='')
+        self._size = self._file.tell()
+        if self._size == 0 and self.header:
+            self._write(self.header)
+
+    def _write(self, text):
+        self._file.write(text)
+        self._size += len(text.encode('utf-8'))
+
+    def _rotate(self):
+        self._file.close()
+        rotate(self.path, self.backups)
+        self._open()
+
+    def write(self, text):
+        """Write text (whole lines), rotating first if it would overflow the file"""
+        if self.max_bytes and self._size + len(text.encode('utf-8')) > self.max_bytes \
+                and self._size > len(self.header):
+            self._rotate()
+        self._write(text)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def format_rows(timestamp, records, interfaces):
+    """CSV text for one sample: one row per BSSID plus one per connected interface"""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    ts = f"{timestamp:.3f}"
+    for r in records:
+        writer.writerow([ts, 'scan', r.ssid, r.bssid, r.signal, r.channel, r.radio_type, r.band])
+    for i in interfaces:
+        if i.ssid:
+            writer.writerow([ts, 'connected', i.ssid, i.bssid, i.signal, i.channel, i.radio_type, i.band])
+    return out.getvalue()
+
+
+def csv_header():
+    return ','.join(FIELDS) + '\n'
+
+
+def run_collector(writer, interval=5.0, duration=None, count=None, stop=None,
+                  scan=scan_networks, interfaces=scan_interfaces, log=None, db=None):
+    """Sample every `interval` seconds until duration/count is reached or stop is set
+
+    Returns the number of samples written. Missed ticks (slow scans) are
+    skipped rather than queued, so the schedule never drifts behind. With
+    log (a wifimon.samplelog.SampleLog) or db (a wifimon.database.SqliteSink),
+    every sample is written to them too.
+    """
+    stop = stop if stop is not None else threading.Event()
+    started = time.monotonic()
+    deadline = started + duration if duration else None
+    next_tick = started
+    n = 0
+    while not stop.is_set():
+        try:
+            t, records, ifaces = time.time(), scan(), interfaces()
+            rows = format_rows(t, records, ifaces)
+        except Exception as e:
+            print(f"Collector error: {e}")
+            rows = ''
+        if rows:
+            writer.write(rows)
+            # A failing sink never costs the CSV (or the other sink) its rows
+            if log is not None:
+                try:
+                    log.append_scan(t, records, ifaces)
+                except Exception as e:
+                    print(f"Sample log error: {e}")
+            if db is not None:
+                try:
+                    db.write_scan(t, records, ifaces)
+                except Exception as e:
+                    print(f"Database error: {e}")
+        n += 1
+        if count and n >= count:
+            break
+        now = time.monotonic()
+        next_tick += interval
+        if next_tick < now:
+            next_tick = now + interval - (now - next_tick) % interval
+        if deadline is not None and next_tick >= deadline:
+            break
+        stop.wait(next_tick - now)
+    return n
@@ -0,0 +1,162 @@
+"""Optional SQLite sink for samples, with time-range queries returning NumPy arrays
+
+SqliteSink never touches the database on the caller's thread: write_scan()
+queues the rows of one scan and a daemon thread inserts everything queued
+so far in one transaction. The database runs in WAL mode, so
+SampleDatabase can query it while the sink is writing. Rows have the same
+fields as the daemon's CSV files (wifimon.collector.FIELDS).
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    ssid TEXT,
+    bssid TEXT,
+    signal REAL,
+    channel INTEGER,
+    radio_type TEXT,
+    band TEXT
+);
+CREATE INDEX IF NOT EXISTS samples_ssid_ts ON samples (ssid, ts);
+CREATE INDEX IF NOT EXISTS samples_channel_ts ON samples (channel, ts);
+"""
+
+INSERT = "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Columns returned by SampleDatabase.query(); signals are %, -1 when missing; channel 0 when missing
+COLUMNS = np.dtype([('ts', 'f8'), ('signal', 'f4'), ('channel', 'i2')])
+
+
+def connect(path):
+    """Connection with the schema created and WAL enabled"""
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; only the last commits can be lost
+    db.executescript(SCHEMA)
+    return db
+
+
+class SqliteSink:
+    """Insert samples from a background thread, one transaction per batch
+
+    Each write_scan() call is one scan; the writer thread takes every scan
+    queued when it wakes up and inserts them together, so a slow disk
+    produces bigger transactions instead of a backlog. When the queue is
+    full the scan is dropped (counted in `dropped`), never waited for.
+    """
+
+    def __init__(self, path, queue_size=256):
+        self.path = path
+        self.written = 0
+        self.dropped = 0
+        self.transactions = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        connect(path).close()  # creates the schema now, so queries work right away
+        self._thread = threading.Thread(target=self._run, name='wifi-sqlite', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _put(self, rows):
+        if not rows:
+            return
+        try:
+            self._queue.put_nowait(rows)
+        except queue.Full:
+            self.dropped += 1
+
+    def write_scan(self, t, records, interfaces=()):
+        """Queue the BssidRecords of one scan and the connected InterfaceRecords"""
+        rows = [(t, 'scan', r.ssid, r.bssid, r.signal, r.channel, r.radio_type, r.band)
+                for r in records]
+        rows += [(t, 'connected', i.ssid, i.bssid, i.signal, i.channel, i.radio_type, i.band)
+                 for i in interfaces if i.ssid]
+        self._put(rows)
+
+    def close(self, timeout=5.0):
+        """Insert what is still queued and close the database"""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+    def _run(self):
+        db = connect(self.path)
+        try:
+            done = False
+            while not done:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    done = True
+                    batch = [rows for rows in batch if rows is not None]
+                rows = [row for scan in batch for row in scan]
+                if not rows:
+                    continue
+                try:
+                    with db:  # one transaction
+                        db.executemany(INSERT, rows)
+                    self.written += len(rows)
+                    self.transactions += 1
+                except sqlite3.Error as e:
+                    print(f"SQLite error: {e}")
+        finally:
+            db.close()
+
+
+class SampleDatabase:
+    """Read-only queries over a sink's database"""
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def ssids(self):
+        return [row[0] for row in self._db.execute(
+            "SELECT DISTINCT ssid FROM samples WHERE ssid IS NOT NULL ORDER BY ssid")]
+
+    def query(self, ssid=None, channel=None, start=None, end=None, kind='scan'):
+        """Structured array (COLUMNS) of the matching samples, oldest first
+
+        ssid and channel each select one of the indexed lookups; start / end
+        are seconds since the epoch.
+        """
+        where, params = [], []
+        for column, op, value in (('ssid', '=', ssid), ('channel', '=', channel),
+                                  ('ts', '>=', start), ('ts', '<=', end), ('kind', '=', kind)):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = "SELECT ts, IFNULL(signal, -1), IFNULL(channel, 0) FROM samples"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts"
+        return np.fromiter(self._db.execute(sql, params), dtype=COLUMNS)
+
+    def series(self, ssid, start=None, end=None, kind='scan'):
+        """(times in seconds, signals) of ssid, samples without a signal left out"""
+        rows = self.query(ssid=ssid, start=start, end=end, kind=kind)
+        rows = rows[rows['signal'] >= 0]
+        return rows['ts'], rows['signal']
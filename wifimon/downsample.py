@@ -0,0 +1,64 @@
+"""Largest-Triangle-Three-Buckets downsampling of a series to a pixel budget
+
+lttb() keeps the first and last points and one point per bucket in
+between: the one forming the largest triangle with the point kept in the
+previous bucket and the mean of the next bucket, which keeps drops and
+spikes that plain decimation would skip. Classic LTTB walks the buckets
+one after the other; here every bucket is scored at once on a padded
+(buckets x bucket size) array, first against the previous bucket's mean,
+then again against the points picked by that first pass.
+"""
+
+import numpy as np
+
+# Scoring passes. Spikes and drops are kept as by sequential LTTB after one pass; the
+# second one anchors on picked points, which brings smooth stretches closer to it too
+_PASSES = 2
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the n_out points of (x, y) that LTTB keeps (all of them when n_out >= len)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n - 2 inner points in m buckets; bucket b is [edges[b], edges[b + 1])
+    m = n_out - 2
+    edges = np.linspace(1, n - 1, m + 1).astype(np.int64)
+    sizes = np.diff(edges)
+    idx = edges[:-1, None] + np.arange(sizes.max())
+    valid = idx < edges[1:, None]
+    idx = np.minimum(idx, n - 2)
+    bx, by = x[idx], y[idx]
+
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+    cx = np.append(mean_x[1:], x[-1])[:, None]
+    cy = np.append(mean_y[1:], y[-1])[:, None]
+    ax = np.insert(mean_x[:-1], 0, x[0])[:, None]
+    ay = np.insert(mean_y[:-1], 0, y[0])[:, None]
+    rows = np.arange(m)
+    for _ in range(_PASSES):
+        area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+        area[~valid] = -1.0
+        picked = idx[rows, area.argmax(axis=1)]
+        ax = np.insert(x[picked[:-1]], 0, x[0])[:, None]
+        ay = np.insert(y[picked[:-1]], 0, y[0])[:, None]
+    return np.concatenate(([0], picked, [n - 1]))
+
+
+def lttb(x, y, n_out):
+    """(x, y) reduced to at most n_out points"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= n_out:
+        return x, y
+    keep = lttb_indices(x, y, n_out)
+    return x[keep], y[keep]
+
+
+def pixel_budget(ax, minimum=100):
+    """Width of an axis in display pixels (points worth drawing on it)"""
+    return max(minimum, int(ax.bbox.width))
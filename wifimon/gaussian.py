@@ -0,0 +1,58 @@
+"""Cached peak-normalized Gaussian curves (no scipy on the plotting path)"""
+
+import functools
+import math
+
+import numpy as np
+
+
+def peak_normalized(x, mean, std):
+    """Gaussian with peak 1 at x=mean, i.e. norm.pdf(x, mean, std) / norm.pdf(mean, mean, std)"""
+    return np.exp(-0.5 * ((np.asarray(x, dtype=float) - mean) / std) ** 2)
+
+
+def peak_normalized_at(value, mean, std):
+    """Scalar peak_normalized, e.g. for the current-signal marker"""
+    return math.exp(-0.5 * ((value - mean) / std) ** 2)
+
+
+class GaussianCurves:
+    """Peak-normalized curves keyed by (mean, std) quantized to `resolution`
+
+    Networks whose mean/std move by less than the resolution between frames
+    reuse the same arrays; returned arrays are shared and read-only.
+    """
+
+    def __init__(self, x_min=0, x_max=100, points=200, resolution=0.1, maxsize=1024):
+        self.x = np.linspace(x_min, x_max, points)
+        self.x.flags.writeable = False
+        self.x_min = x_min
+        self.x_max = x_max
+        self.points = points
+        self.resolution = resolution
+        self._curve = functools.lru_cache(maxsize)(self._compute_curve)
+        self._detailed = functools.lru_cache(maxsize)(self._compute_detailed)
+
+    def _key(self, mean, std):
+        return round(mean / self.resolution), max(1, round(std / self.resolution))
+
+    def _readonly(self, array):
+        array.flags.writeable = False
+        return array
+
+    def _compute_curve(self, qmean, qstd):
+        mean, std = qmean * self.resolution, qstd * self.resolution
+        return self._readonly(peak_normalized(self.x, mean, std))
+
+    def _compute_detailed(self, qmean, qstd, width):
+        mean, std = qmean * self.resolution, qstd * self.resolution
+        x = np.linspace(max(self.x_min, mean - width * std), min(self.x_max, mean + width * std), self.points)
+        return self._readonly(x), self._readonly(peak_normalized(x, mean, std))
+
+    def curve(self, mean, std):
+        """y on the shared grid self.x"""
+        return self._curve(*self._key(mean, std))
+
+    def detailed(self, mean, std, width=3):
+        """(x, y) on a grid spanning mean +/- width*std, clipped to [x_min, x_max]"""
+        return self._detailed(*self._key(mean, std), width)
@@ -0,0 +1,238 @@
+"""Linux scan backend: /proc/net/wireless for the link, iw / nmcli for neighbours
+
+The parsers take plain text, so they can be fed fixture files; LinuxBackend
+takes the /proc path and the command runner for the same reason.
+"""
+
+import shlex
+import time
+
+from wifimon.backend import Backend
+from wifimon.parser import BssidRecord, InterfaceRecord
+from wifimon.scan import CommandChain, run_command
+
+PROC_WIRELESS = '/proc/net/wireless'
+
+# ----------------- Conversions -----------------
+
+
+def dbm_to_percent(dbm):
+    """netsh-style signal quality: -100 dBm -> 0 %, -50 dBm and above -> 100 %"""
+    return max(0, min(100, int(round(2 * (dbm + 100)))))
+
+
+def freq_to_channel(freq):
+    """Channel number of a centre frequency in MHz (None when unknown)"""
+    freq = int(freq)
+    if freq == 2484:
+        return 14
+    if 2412 <= freq <= 2472:
+        return (freq - 2407) // 5
+    if 5955 <= freq <= 7115:
+        return (freq - 5950) // 5
+    if 5000 <= freq <= 5925:
+        return (freq - 5000) // 5
+    return None
+
+
+def freq_to_band(freq):
+    if freq < 3000:
+        return '2.4 GHz'
+    if freq < 5925:
+        return '5 GHz'
+    return '6 GHz'
+
+
+def _unescape_ssid(ssid):
+    """iw prints non-ASCII SSID bytes as \\xNN"""
+    if '\\x' not in ssid:
+        return ssid
+    raw = ssid.encode('latin-1', 'replace').decode('unicode_escape').encode('latin-1')
+    return raw.decode('utf-8', 'replace')
+
+# ----------------- Parsers -----------------
+
+
+def parse_proc_wireless(text):
+    """{interface: (link quality, level dBm, noise dBm)} from /proc/net/wireless"""
+    links = {}
+    for line in text.splitlines()[2:]:
+        name, sep, rest = line.partition(':')
+        fields = rest.split()
+        if not sep or len(fields) < 4:
+            continue
+        try:
+            link, level, noise = (float(f.rstrip('.')) for f in fields[1:4])
+        except ValueError:
+            continue
+        if level > 0:
+            level -= 256  # drivers reporting an unsigned byte
+        links[name.strip()] = (link, level, noise)
+    return links
+
+
+def parse_iw_scan(text):
+    """BssidRecord list from `iw dev <if> scan [dump]` (signal converted to %)"""
+    records = []
+    current = None
+
+    def flush():
+        bssid, ssid, dbm, freq, channel, caps = current
+        radio = ('802.11ax' if 'HE' in caps else '802.11ac' if 'VHT' in caps else
+                 '802.11n' if 'HT' in caps else
+                 ('802.11g' if freq < 3000 else '802.11a') if freq else None)
+        records.append(BssidRecord(
+            ssid, bssid, dbm_to_percent(dbm) if dbm is not None else None,
+            channel if channel is not None else freq_to_channel(freq) if freq else None,
+            radio, freq_to_band(freq) if freq else None))
+
+    for line in text.splitlines():
+        if line.startswith('BSS '):
+            if current is not None:
+                flush()
+            current = [line[4:].split('(', 1)[0].strip(), '', None, None, None, set()]
+            continue
+        if current is None:
+            continue
+        s = line.strip()
+        if s.startswith('SSID:'):
+            current[1] = _unescape_ssid(s[5:].strip())
+        elif s.startswith('signal:'):
+            current[2] = float(s.split()[1])
+        elif s.startswith('freq:'):
+            current[3] = float(s.split()[1])
+        elif s.startswith('DS Parameter set: channel'):
+            current[4] = int(s.rsplit(' ', 1)[1])
+        elif s.startswith('* primary channel:') and current[4] is None:
+            current[4] = int(s.rsplit(' ', 1)[1])
+        elif s in ('HT capabilities:', 'VHT capabilities:', 'HE capabilities:'):
+            current[5].add(s.split()[0])
+    if current is not None:
+        flush()
+    return records
+
+
+def _split_terse(line):
+    """Split an `nmcli -t` line on unescaped colons"""
+    fields, field, escaped = [], [], False
+    for ch in line:
+        if escaped:
+            field.append(ch)
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch == ':':
+            fields.append(''.join(field))
+            field = []
+        else:
+            field.append(ch)
+    fields.append(''.join(field))
+    return fields
+
+
+NMCLI_FIELDS = 'SSID,BSSID,SIGNAL,CHAN,FREQ'
+
+
+def parse_nmcli(text):
+    """BssidRecord list from `nmcli -t -f SSID,BSSID,SIGNAL,CHAN,FREQ device wifi list`"""
+    records = []
+    for line in text.splitlines():
+        fields = _split_terse(line)
+        if len(fields) != 5:
+            continue
+        ssid, bssid, signal, channel, freq = fields
+        try:
+            freq = int(freq.split()[0])
+            records.append(BssidRecord(ssid, bssid.lower(), int(signal), int(channel), None,
+                                       freq_to_band(freq)))
+        except (ValueError, IndexError):
+            continue
+    return records
+
+
+def parse_iw_link(text):
+    """(ssid, bssid, freq) of `iw dev <if> link`, or None when not connected"""
+    if not text.startswith('Connected to '):
+        return None
+    bssid = text[len('Connected to '):].split(None, 1)[0]
+    ssid, freq = '', None
+    for line in text.splitlines()[1:]:
+        s = line.strip()
+        if s.startswith('SSID:'):
+            ssid = _unescape_ssid(s[5:].strip())
+        elif s.startswith('freq:'):
+            freq = float(s.split()[1])
+    return ssid, bssid, freq
+
+# ----------------- Backend -----------------
+
+
+class LinuxBackend(Backend):
+    """Link quality straight from /proc/net/wireless, neighbours from iw or nmcli
+
+    interfaces()/link() read the signal level from /proc without spawning a
+    process; the SSID/BSSID/frequency of each link come from `iw dev <if>
+    link` and are cached for link_ttl seconds, so sampling at 10+ Hz costs
+    one file read per sample. `run` is any cmd -> stdout callable.
+    """
+
+    name = 'linux'
+
+    def __init__(self, interface=None, proc_path=PROC_WIRELESS, run=run_command,
+                 link_ttl=30.0, clock=time.monotonic):
+        self.interface = interface
+        self.proc_path = proc_path
+        self.run = run
+        self.link_ttl = link_ttl
+        self.clock = clock
+        self._links = {}  # interface -> (expires, parse_iw_link result)
+        self._chain = CommandChain([('iw', self._iw_scan), ('nmcli', self._nmcli_scan)], empty=[])
+
+    def read_proc(self):
+        try:
+            with open(self.proc_path, encoding='utf-8', errors='replace') as f:
+                return parse_proc_wireless(f.read())
+        except OSError:
+            return {}
+
+    def _interfaces(self):
+        if self.interface:
+            return [self.interface]
+        return list(self.read_proc())
+
+    def _iw_scan(self):
+        records = []
+        for name in self._interfaces():
+            records.extend(parse_iw_scan(self.run(f"iw dev {shlex.quote(name)} scan dump")))
+        return records
+
+    def _nmcli_scan(self):
+        return parse_nmcli(self.run(f"nmcli -t -f {NMCLI_FIELDS} device wifi list"))
+
+    def networks(self):
+        """Neighbour list from iw, falling back to nmcli (remembered, see CommandChain)"""
+        return self._chain()
+
+    def _link_info(self, name):
+        now = self.clock()
+        cached = self._links.get(name)
+        if cached is None or now >= cached[0]:
+            cached = (now + self.link_ttl, parse_iw_link(self.run(f"iw dev {shlex.quote(name)} link")))
+            self._links[name] = cached
+        return cached[1]
+
+    def interfaces(self):
+        links = self.read_proc()
+        names = [self.interface] if self.interface else list(links)
+        interfaces = []
+        for name in names:
+            if name not in links:
+                continue
+            _, level, _ = links[name]
+            info = self._link_info(name)
+            ssid, bssid, freq = info if info is not None else (None, None, None)
+            interfaces.append(InterfaceRecord(
+                name, 'connected' if info is not None else 'disconnected', ssid, bssid,
+                dbm_to_percent(level), freq_to_channel(freq) if freq else None, None,
+                freq_to_band(freq) if freq else None, int(level)))
+        return interfaces
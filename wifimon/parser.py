@@ -0,0 +1,209 @@
+"""Single-pass parser for netsh wlan output (English and French labels)"""
+
+import re
+import collections
+
+# ----------------- Records -----------------
+
+BssidRecord = collections.namedtuple(
+    'BssidRecord', ['ssid', 'bssid', 'signal', 'channel', 'radio_type', 'band'])
+
+InterfaceRecord = collections.namedtuple(
+    'InterfaceRecord', ['name', 'state', 'ssid', 'bssid', 'signal', 'channel',
+                        'radio_type', 'band', 'rssi'])
+
+# ----------------- Patterns -----------------
+
+# netsh labels (EN + FR, as printed) mapped to record fields
+_NETWORK_KEYS = {
+    'SSID': 'ssid',
+    'Nom du réseau': 'ssid',
+    'Profile': 'ssid',
+    'Profil': 'ssid',
+    'BSSID': 'bssid',
+    'Signal': 'signal',
+    'Signal Quality': 'signal',
+    'Strength': 'signal',
+    'Channel': 'channel',
+    'Canal': 'channel',
+    'Radio type': 'radio_type',
+    'Type de radio': 'radio_type',
+    'Band': 'band',
+    'Bande': 'band',
+}
+
+_INTERFACE_KEYS = {
+    'Name': 'name',
+    'Nom': 'name',
+    'State': 'state',
+    'État': 'state',
+    'SSID': 'ssid',
+    'BSSID': 'bssid',
+    'AP BSSID': 'bssid',
+    'Signal': 'signal',
+    'Channel': 'channel',
+    'Canal': 'channel',
+    'Radio type': 'radio_type',
+    'Type de radio': 'radio_type',
+    'Band': 'band',
+    'Bande': 'band',
+    'Rssi': 'rssi',
+}
+
+_NUMERIC_FIELDS = ('signal', 'channel', 'rssi')
+
+
+def _line_pattern(keys):
+    """Compile "<label> [index] : value" for known labels
+
+    The pattern starts with a literal newline so the regex engine can skip
+    straight from line to line; callers prepend one to the text.
+    """
+    labels = '|'.join(re.escape(k) for k in sorted(keys, key=len, reverse=True))
+    return re.compile(r'\n[ \t\xa0]*(' + labels + r')(?:[ \t\xa0]+\d+)?[ \t\xa0]*:'
+                      r'[ \t\xa0]*([^\r\n]*)')
+
+
+def _slots(keys, record):
+    """Map each label to (field index, numeric?) in record"""
+    return {label: (record._fields.index(field), field in _NUMERIC_FIELDS)
+            for label, field in keys.items()}
+
+
+_NETWORK_LINE = _line_pattern(_NETWORK_KEYS)
+_NETWORK_SLOTS = _slots(_NETWORK_KEYS, BssidRecord)
+_INTERFACE_LINE = _line_pattern(_INTERFACE_KEYS)
+_INTERFACE_SLOTS = _slots(_INTERFACE_KEYS, InterfaceRecord)
+
+
+def _number(value):
+    """Leading integer of "88%", "-50" or "36", else None"""
+    try:
+        return int(value.rstrip().rstrip('%'))
+    except ValueError:
+        return None
+
+# ----------------- Parsers -----------------
+
+
+def iter_networks(text):
+    """Yield one BssidRecord per BSSID of `netsh wlan show networks [mode=bssid]`
+
+    SSIDs listed without any BSSID block (plain `show networks`) still yield
+    a single record with bssid=None. Hidden networks keep an empty ssid.
+    """
+    current = None
+    for label, value in _NETWORK_LINE.findall('\n' + text):
+        i, numeric = _NETWORK_SLOTS[label]
+        value = _number(value) if numeric else value.rstrip()
+        if i == 0:
+            if current is not None:
+                yield BssidRecord._make(current)
+            current = [value, None, None, None, None, None]
+        elif current is None:
+            continue
+        elif i == 1 and (current[1] is not None or current[2] is not None):
+            # Next BSSID block of the same SSID
+            yield BssidRecord._make(current)
+            current = [current[0], value, None, None, None, None]
+        else:
+            current[i] = value
+    if current is not None:
+        yield BssidRecord._make(current)
+
+
+def parse_networks(text):
+    """Parse scan output into a list of BssidRecord"""
+    return list(iter_networks(text))
+
+
+def parse_interfaces(text):
+    """Parse `netsh wlan show interfaces` into a list of InterfaceRecord"""
+    interfaces = []
+    current = None
+    for label, value in _INTERFACE_LINE.findall('\n' + text):
+        i, numeric = _INTERFACE_SLOTS[label]
+        if i == 0 or current is None:
+            if current is not None:
+                interfaces.append(InterfaceRecord._make(current))
+            current = [None] * len(InterfaceRecord._fields)
+        current[i] = _number(value) if numeric else value.rstrip()
+    if current is not None:
+        interfaces.append(InterfaceRecord._make(current))
+    return interfaces
+
+# ----------------- Aggregation -----------------
+
+
+def signals_by_ssid(records):
+    """Group signal percentages per visible SSID, in scan order"""
+    networks = {}
+    for rec in records:
+        if not rec.ssid:
+            continue
+        signals = networks.setdefault(rec.ssid, [])
+        if rec.signal is not None:
+            signals.append(rec.signal)
+    return networks
+
+
+def strongest_by_ssid(records, default=0):
+    """Strongest signal percentage per visible SSID (default when none reported)"""
+    return {ssid: max(signals) if signals else default
+            for ssid, signals in signals_by_ssid(records).items()}
+
+
+def connected_wifi(interfaces):
+    """Return (ssid, signal %) of the first interface with an SSID"""
+    for iface in interfaces:
+        if iface.ssid:
+            return iface.ssid, iface.signal
+    return None, None
+
+# ----------------- Formatting -----------------
+
+
+def format_networks(records, interface='Wi-Fi'):
+    """`netsh wlan show networks mode=bssid` text for BssidRecords (inverse of parse_networks)"""
+    groups = {}
+    for rec in records:
+        groups.setdefault(rec.ssid or '', []).append(rec)
+    lines = [f"Interface name : {interface}",
+             f"There are {len(groups)} networks currently visible.", ""]
+    for n, (ssid, group) in enumerate(groups.items(), 1):
+        lines += [f"SSID {n} : {ssid}",
+                  "    Network type            : Infrastructure",
+                  "    Authentication          : WPA2-Personal",
+                  "    Encryption              : CCMP"]
+        for b, rec in enumerate(group, 1):
+            if rec.bssid is None:
+                continue
+            lines.append(f"    BSSID {b}                 : {rec.bssid}")
+            if rec.signal is not None:
+                lines.append(f"         Signal             : {rec.signal}%")
+            if rec.radio_type:
+                lines.append(f"         Radio type         : {rec.radio_type}")
+            if rec.band:
+                lines.append(f"         Band               : {rec.band}")
+            if rec.channel is not None:
+                lines.append(f"         Channel            : {rec.channel}")
+        lines.append("")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def format_interfaces(interfaces):
+    """`netsh wlan show interfaces` text for InterfaceRecords (inverse of parse_interfaces)"""
+    lines = [f"There is {len(interfaces)} interface on the system: ", ""]
+    labels = (('name', 'Name'), ('state', 'State'), ('ssid', 'SSID'), ('bssid', 'AP BSSID'),
+              ('band', 'Band'), ('channel', 'Channel'), ('radio_type', 'Radio type'),
+              ('signal', 'Signal'), ('rssi', 'Rssi'))
+    for iface in interfaces:
+        for field, label in labels:
+            value = getattr(iface, field)
+            if value is None:
+                continue
+            if field == 'signal':
+                value = f"{value}%"
+            lines.append(f"    {label:<23}: {value}")
+        lines.append("")
+    return "\r\n".join(lines) + "\r\n"
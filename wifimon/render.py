@@ -0,0 +1,288 @@
+"""Incremental time-series rendering: persistent artists + blitting
+
+Static decorations (signal zones, axis labels, ticks, title) are drawn once
+into a cached background, and the legend into a copy of it when it changes;
+every frame only the network lines and their value labels are redrawn on
+top. A full redraw only happens when the decorations change (new title,
+time window shift, zoom, resize), never because networks come, go or swap
+places.
+Only the part of a series inside the time window is drawn, reduced with
+LTTB (wifimon.downsample) when it has more points than the axis is wide
+in pixels.
+"""
+
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from wifimon.downsample import lttb, pixel_budget
+
+
+class Blitter:
+    """Redraw a fixed set of animated artists over a cached figure background
+
+    Artists added with add() are redrawn every frame. Those added with
+    add_layer() (e.g. a legend that changes now and then) are drawn into a
+    second copy of the background, which is only redone when a layer artist
+    is added or removed, so they cost nothing on frames where they do not
+    change and never need a full draw.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._clean = None  # background without the layer artists
+        self._background = None  # background with them
+        self._artists = []
+        self._layer = []
+        self._relayer = False
+        self._cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, *artists):
+        for artist in artists:
+            artist.set_animated(True)
+            self._artists.append(artist)
+
+    def add_layer(self, *artists):
+        for artist in artists:
+            artist.set_animated(True)
+            self._layer.append(artist)
+        self._relayer = True
+
+    def remove(self, *artists):
+        for artist in artists:
+            if artist in self._layer:
+                self._layer.remove(artist)
+                self._relayer = True
+            else:
+                self._artists.remove(artist)
+
+    def _on_draw(self, event):
+        # Any full draw (ours, a resize, a zoom...) refreshes the background
+        self._clean = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_layer()
+        self._draw(self._artists)
+
+    def _draw_layer(self):
+        self._draw(self._layer)
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox) \
+            if self._layer else self._clean
+        self._relayer = False
+
+    def _draw(self, artists):
+        figure = self.canvas.figure
+        for artist in artists:
+            figure.draw_artist(artist)
+
+    def update(self, full=False):
+        """Blit the animated artists, or redraw everything when full is set"""
+        if full or self._background is None:
+            self.canvas.draw()
+        else:
+            if self._relayer:
+                self.canvas.restore_region(self._clean)
+                self._draw_layer()
+            else:
+                self.canvas.restore_region(self._background)
+            self._draw(self._artists)
+            self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+
+class SignalPanel:
+    """One persistent Line2D and value label per network on a time axis
+
+    update() only calls set_data on lines whose series got a new sample and
+    reports whether the static part of the axis changed (needs a full draw).
+    The legend is a Blitter layer, rebuilt when the labelled lines change
+    without a full draw.
+    Lines get at most max_points points (default: the axis width in pixels).
+    Entries after the first `labelled` are drawn together as one thin
+    LineCollection, without markers, value labels or legend entries. A
+    labelled entry keeps its line while its value stays within `hysteresis`
+    of the last of the first `labelled`, so drifting signals do not keep
+    swapping lines in and out of the legend.
+    A labelled line keeps its colour while it stays shown; a new or
+    returning one takes the first colour no other shown line uses.
+    """
+
+    def __init__(self, ax, blitter, origin_ms, fmt='o-', linewidth=2, colors=None,
+                 fontsize=8, value_fmt='{:.0f}', value_offset=1, legend_fontsize=8,
+                 window=120, max_points=None, labelled=8, hysteresis=5):
+        self.ax = ax
+        self.blitter = blitter
+        self.origin_ms = origin_ms
+        self.fmt = fmt
+        self.linewidth = linewidth
+        self.colors = colors
+        self.fontsize = fontsize
+        self.value_fmt = value_fmt
+        self.value_offset = value_offset
+        self.legend_fontsize = legend_fontsize
+        self.window = window
+        self.max_points = max_points
+        self.labelled = labelled
+        self.hysteresis = hysteresis
+        self._artists = {}  # key -> [line, text, last sample drawn]
+        self._others = None  # LineCollection of the unlabelled entries
+        self._segments = {}  # key -> (last sample drawn, points) in _others
+        self._stale = True
+        self._legend = None  # animated legend, rebuilt when the labelled lines change
+        self._legend_stale = True
+        self._reframe = False
+
+    def set_title(self, title):
+        if title != self.ax.get_title():
+            self.ax.set_title(title)
+            self._stale = True
+
+    def _free_color(self, used):
+        """First colour of the palette not in used (cycling once they are all taken)"""
+        for color in self.colors:
+            if color not in used:
+                return color
+        return self.colors[len(used) % len(self.colors)]
+
+    def _create(self, key, label, color):
+        style = {'color': color} if color is not None else {}
+        line, = self.ax.plot([], [], self.fmt, linewidth=self.linewidth, label=label, **style)
+        text = self.ax.text(0, 0, '', fontsize=self.fontsize, color=line.get_color())
+        self.blitter.add(line, text)
+        self._artists[key] = [line, text, None]
+        self._legend_stale = True
+        return self._artists[key]
+
+    def set_window(self, window):
+        """Show `window` seconds from the next update(), redrawing every line (e.g. on zoom)"""
+        self.window = window
+        for artists in self._artists.values():
+            artists[2] = None
+        self._segments.clear()
+        self._reframe = True
+        self._stale = True
+
+    def discard(self, key):
+        """Remove the line and label of a network that is no longer tracked"""
+        self._segments.pop(key, None)
+        artists = self._artists.pop(key, None)
+        if artists is None:
+            return
+        line, text, _ = artists
+        self.blitter.remove(line, text)
+        line.remove()
+        text.remove()
+        self._legend_stale = True
+
+    def _points(self, series, now):
+        """(x, y) of the part of series inside the time window, reduced to the pixel budget"""
+        times, values = series.times(), series.values()
+        # The window's left edge never goes past now - 1.25 window; keep one point before it
+        first = max(0, int(np.searchsorted(
+            times, self.origin_ms + (now - 1.25 * self.window) * 1000)) - 1)
+        budget = self.max_points or pixel_budget(self.ax)
+        return lttb((times[first:] - self.origin_ms) / 1000, values[first:], budget)
+
+    def _update_others(self, entries, now):
+        segments = {}
+        for key, _, series in entries:
+            if not len(series):
+                continue
+            last = series.last()
+            cached = self._segments.get(key)
+            segments[key] = cached if cached is not None and cached[0] == last \
+                else (last, np.column_stack(self._points(series, now)))
+        self._segments = segments
+        if self._others is None:
+            if not segments:
+                return
+            self._others = LineCollection([], colors='0.4', linewidths=1, alpha=0.6)
+            self.ax.add_collection(self._others, autolim=False)
+            self.blitter.add(self._others)
+        self._others.set_segments([points for _, points in segments.values()])
+
+    def _split(self, entries):
+        """(labelled, others) entries, both in the given order"""
+        entries = [entry for entry in entries if len(entry[2])]
+        if len(entries) <= self.labelled:
+            return entries, []
+        floor = entries[self.labelled - 1][2].last()[1] - self.hysteresis
+        keep = {key for key, _, series in entries
+                if key in self._artists and self._artists[key][0].get_visible()
+                and series.last()[1] >= floor}
+        for key, _, _ in entries:
+            if len(keep) >= self.labelled:
+                break
+            keep.add(key)
+        return ([entry for entry in entries if entry[0] in keep],
+                [entry for entry in entries if entry[0] not in keep])
+
+    def update(self, entries, now):
+        """Draw entries [(key, label, RingSeries)], strongest first, at time `now` (s since origin)
+
+        Returns True when a full redraw is needed.
+        """
+        entries, others = self._split(entries)
+        self._update_others(others, now)
+        # Lines that stay on screen keep their colour; new and returning ones take a free one
+        used = [self._artists[key][0].get_color() for key, _, _ in entries
+                if key in self._artists and self._artists[key][0].get_visible()]
+        shown = set()
+        for key, label, series in entries:
+            artists = self._artists.get(key)
+            if artists is None:
+                color = self._free_color(used) if self.colors else None
+                artists = self._create(key, label, color)
+                used.append(color)
+            line, text, drawn = artists
+            if self.colors and not line.get_visible():
+                if line.get_color() in used:
+                    line.set_color(self._free_color(used))
+                    text.set_color(line.get_color())
+                used.append(line.get_color())
+            if line.get_label() != label:
+                line.set_label(label)
+                self._legend_stale = True
+            if not line.get_visible():
+                line.set_visible(True)
+                text.set_visible(True)
+                self._legend_stale = True
+            last = series.last()
+            if last != drawn:
+                line.set_data(*self._points(series, now))
+                text.set_position((now, last[1] + self.value_offset))
+                text.set_text(self.value_fmt.format(last[1]))
+                artists[2] = last
+            shown.add(key)
+
+        for key, (line, text, _) in self._artists.items():
+            if key not in shown and line.get_visible():
+                line.set_visible(False)
+                text.set_visible(False)
+                self._legend_stale = True
+
+        # Slide the time window in quarter-window steps so ticks only move now and then
+        right = self.ax.get_xlim()[1]
+        if now + 5 > right or self._reframe:
+            self._reframe = False
+            right = now + 5 + self.window / 4
+            self.ax.set_xlim(max(0, right - self.window - self.window / 4), right)
+            self._stale = True
+
+        if self._legend_stale:
+            self._legend_stale = False
+            self._update_legend()
+        stale, self._stale = self._stale, False
+        return stale
+
+    def _update_legend(self):
+        if self._legend is not None:
+            self.blitter.remove(self._legend)
+        elif self.ax.get_legend() is not None:
+            self._stale = True  # a static legend from the script is in the background
+        handles = [h for h in self.ax.patches + self.ax.lines
+                   if h.get_visible() and not h.get_label().startswith('_')]
+        if handles:
+            self._legend = self.ax.legend(handles=handles, fontsize=self.legend_fontsize)
+            self.blitter.add_layer(self._legend)
+        else:
+            if self.ax.get_legend() is not None:
+                self.ax.get_legend().remove()
+            self._legend = None
@@ -0,0 +1,295 @@
+"""Replay recorded scans through the plotting scripts, without WLAN hardware
+
+A ReplaySource holds recorded netsh outputs (capture archives from
+wifimon.capture, or CSV files from the daemon rendered back to netsh text)
+and serves the one due at the warped time `start + elapsed * speed`.
+replay_subprocess() routes the scripts' netsh/PowerShell calls to it, so
+their own scan functions parse the recorded text unchanged, and
+run_frontend() drives a script's animation timer headless (Agg) and
+reports the frame rate and per-frame latency; load_function() takes one
+function out of a script without running the script.
+"""
+
+import ast
+import bisect
+import collections
+import contextlib
+import csv
+import io
+import os
+import platform
+import subprocess
+import time
+import warnings
+
+from wifimon.capture import iter_captures
+from wifimon.parser import BssidRecord, InterfaceRecord, format_networks, format_interfaces
+
+NETWORKS = 'networks'
+INTERFACES = 'interfaces'
+
+
+def command_kind(cmd):
+    """NETWORKS / INTERFACES for a scan command, None for anything else"""
+    cmd = cmd if isinstance(cmd, str) else ' '.join(str(c) for c in cmd)
+    if 'netsh' not in cmd and 'powershell' not in cmd:
+        return None
+    return INTERFACES if 'interfaces' in cmd else NETWORKS
+
+# ----------------- Recordings -----------------
+
+
+def _with_rotated(path):
+    """path.N ... path.1, path (oldest first), those that exist"""
+    paths = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        paths.append(f"{path}.{i}")
+        i += 1
+    return paths[::-1] + ([path] if os.path.exists(path) else [])
+
+
+def load_captures(path):
+    """[(time, kind, text)] from a capture archive and its rotated files"""
+    records = []
+    for p in _with_rotated(path):
+        for t, source, text in iter_captures(p):
+            records.append((t, command_kind(source) or NETWORKS, text))
+    return records
+
+
+def load_samples(path):
+    """[(time, kind, text)] from daemon CSV files, rendered back to netsh output"""
+    scans = collections.OrderedDict()
+    links = collections.OrderedDict()
+    for p in _with_rotated(path):
+        with open(p, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                t = float(row['timestamp'])
+                signal = int(row['signal']) if row['signal'] else None
+                channel = int(row['channel']) if row['channel'] else None
+                if row['kind'] == 'connected':
+                    links.setdefault(t, []).append(InterfaceRecord(
+                        'Wi-Fi', 'connected', row['ssid'], row['bssid'] or None, signal, channel,
+                        row['radio_type'] or None, row['band'] or None, None))
+                else:
+                    scans.setdefault(t, []).append(BssidRecord(
+                        row['ssid'], row['bssid'] or None, signal, channel,
+                        row['radio_type'] or None, row['band'] or None))
+    records = [(t, NETWORKS, format_networks(recs)) for t, recs in scans.items()]
+    records += [(t, INTERFACES, format_interfaces(ifaces)) for t, ifaces in links.items()]
+    records.sort(key=lambda r: r[0])
+    return records
+
+
+def load_recording(path):
+    """Capture archive (gzip) or daemon CSV, chosen by content"""
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+    return load_captures(path) if magic == b'\x1f\x8b' else load_samples(path)
+
+
+class ReplaySource:
+    """Recorded outputs served at `speed` times the recorded pace
+
+    output(kind) returns the latest recording of that kind due at the warped
+    time. With loop, playback starts over after the last record.
+    """
+
+    def __init__(self, records, speed=1.0, loop=True, clock=time.monotonic):
+        self.speed = speed
+        self.loop = loop
+        self.clock = clock
+        self._times = {}
+        self._texts = {}
+        for t, kind, text in sorted(records, key=lambda r: r[0]):
+            self._times.setdefault(kind, []).append(t)
+            self._texts.setdefault(kind, []).append(text)
+        times = [t for t, _, _ in records]
+        self.t0 = min(times) if times else 0.0
+        self.span = max(times) - self.t0 if times else 0.0
+        self.served = 0
+        self._started = None
+
+    def recorded_time(self):
+        """Position in the recording (seconds since its first record)"""
+        now = self.clock()
+        if self._started is None:
+            self._started = now
+        elapsed = (now - self._started) * self.speed
+        if self.loop and self.span > 0:
+            elapsed %= self.span
+        return min(elapsed, self.span)
+
+    def output(self, kind):
+        times = self._times.get(kind)
+        if not times:
+            return ''
+        i = bisect.bisect_right(times, self.t0 + self.recorded_time()) - 1
+        self.served += 1
+        return self._texts[kind][max(i, 0)]
+
+# ----------------- subprocess routing -----------------
+
+
+class _ReplayProcess:
+    """Just enough of Popen for the scripts' scan functions"""
+
+    def __init__(self, args, text, returncode=0):
+        self.args = args
+        self.returncode = returncode
+        self.pid = 0
+        stream = io.StringIO if isinstance(text, str) else io.BytesIO
+        self.stdout = stream(text)
+        self.stderr = stream(text[:0])
+
+    def communicate(self, input=None, timeout=None):
+        return self.stdout.read(), self.stderr.read()
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+    terminate = kill
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def _as_requested(text, kwargs):
+    """str when the caller asked for text mode, bytes otherwise"""
+    if kwargs.get('text') or kwargs.get('encoding') or kwargs.get('universal_newlines'):
+        return text
+    return text.encode('utf-8')
+
+
+@contextlib.contextmanager
+def replay_subprocess(source):
+    """Route netsh / PowerShell calls to `source` and report Windows while active"""
+    real_popen, real_run, real_check_output = subprocess.Popen, subprocess.run, subprocess.check_output
+    real_system = platform.system
+
+    def popen(args, *a, **kwargs):
+        kind = command_kind(args)
+        if kind is None:
+            return real_popen(args, *a, **kwargs)
+        return _ReplayProcess(args, _as_requested(source.output(kind), kwargs))
+
+    def run(args, *a, **kwargs):
+        kind = command_kind(args)
+        if kind is None:
+            return real_run(args, *a, **kwargs)
+        out = _as_requested(source.output(kind), kwargs)
+        return subprocess.CompletedProcess(args, 0, out, out[:0])
+
+    def check_output(args, *a, **kwargs):
+        kind = command_kind(args)
+        if kind is None:
+            return real_check_output(args, *a, **kwargs)
+        return _as_requested(source.output(kind), kwargs)
+
+    subprocess.Popen, subprocess.run, subprocess.check_output = popen, run, check_output
+    platform.system = lambda: 'Windows'
+    try:
+        yield source
+    finally:
+        subprocess.Popen, subprocess.run, subprocess.check_output = real_popen, real_run, real_check_output
+        platform.system = real_system
+
+# ----------------- Frontend driver -----------------
+
+
+def load_function(path, name, **namespace):
+    """Function `name` of a script, with its imports and functions but no other module-level code"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    body = [node for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))]
+    exec(compile(ast.Module(body, []), path, 'exec'), namespace)
+    return namespace[name]
+
+
+ReplayReport = collections.namedtuple(
+    'ReplayReport', ['frames', 'elapsed', 'fps', 'p50_ms', 'p95_ms', 'max_ms', 'scans', 'full_draws'])
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_frontend(script, source, frames=100, pace=True):
+    """Run `script` headless on `source` and time `frames` ticks of its animation timer
+
+    The figure is drawn once first, as plt.show() would, then each frame
+    runs everything the script's timer (its FuncAnimation's or its own
+    canvas timer) calls in a GUI event loop, draws included: on Agg,
+    draw_idle() draws right away. The script's Sampler (if any) runs
+    `source.speed` times faster, and frames are spaced by the timer
+    interval divided by the speed. With pace False, frames run back to back
+    and each one is preceded by a synchronous sample. full_draws counts the
+    frames' full canvas draws (draw_event), as opposed to blits.
+    """
+    import runpy
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.font_manager
+    from matplotlib import pyplot as plt
+    from matplotlib.animation import Animation
+    from matplotlib.backend_bases import TimerBase
+    from wifimon.sampler import Sampler
+
+    # Resolve fonts before netsh is patched (the font cache may run fc-list)
+    matplotlib.font_manager.findfont('DejaVu Sans')
+    with replay_subprocess(source), warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # plt.show() on a non-interactive backend
+        g = runpy.run_path(script, run_name='__main__')
+        samplers = [v for v in g.values() if isinstance(v, Sampler)]
+        for sampler in samplers:
+            sampler.stop()
+            if pace:
+                sampler.interval /= source.speed
+                sampler.start()
+        # The first draw starts FuncAnimation's timer and fills the blit backgrounds
+        canvas = plt.gcf().canvas
+        canvas.draw()
+        full_draws = []
+        canvas.mpl_connect('draw_event', full_draws.append)
+        timers = [v.event_source if isinstance(v, Animation) else v for v in g.values()
+                  if isinstance(v, (Animation, TimerBase))]
+        if not timers:
+            raise ValueError(f"{script} starts no animation or timer")
+        timer = timers[0]
+        period = timer.interval / 1000 / source.speed if pace else 0
+
+        latencies = []
+        started = time.perf_counter()
+        next_frame = started
+        for i in range(frames):
+            if not pace:
+                for sampler in samplers:
+                    sampler.sample_once()  # fresh data for every frame, outside the timing
+            t = time.perf_counter()
+            timer._on_timer()
+            latencies.append(time.perf_counter() - t)
+            next_frame += period
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        elapsed = time.perf_counter() - started
+        for sampler in samplers:
+            sampler.stop()
+
+    latencies.sort()
+    return ReplayReport(frames, elapsed, frames / elapsed if elapsed else 0.0,
+                        _percentile(latencies, 0.50) * 1000, _percentile(latencies, 0.95) * 1000,
+                        (latencies[-1] if latencies else 0.0) * 1000, source.served, len(full_draws))
@@ -0,0 +1,116 @@
+"""Per-network min / mean / max / count aggregates at several time resolutions
+
+A Rollup folds every sample into one bucket per resolution (1 minute and 1
+hour by default) as it arrives, and keeps a fixed number of buckets per
+resolution, so hours or days of history take constant memory and plot as
+a constant number of points. RollupSeries has the times() / values() /
+last() interface of store.RingSeries (values are the bucket means), so a
+render.SignalPanel draws either one.
+"""
+
+import numpy as np
+
+# (resolution in seconds, buckets kept): 3 hours of minutes, 7.5 days of hours
+LEVELS = ((60, 180), (3600, 180))
+
+
+class RollupSeries:
+    """Ring of the last `capacity` non-empty buckets of `resolution` seconds
+
+    A slot is only taken when a sample falls in a later bucket than the
+    current one, so periods without samples leave no bucket: the kept
+    buckets are not consecutive in time and may span more than
+    capacity * resolution seconds. Like RingSeries, each bucket is stored
+    twice (at i and i + capacity) so the kept buckets are always one
+    contiguous slice. A sample older than the current bucket is counted in
+    the current bucket.
+    """
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self._res_ms = int(resolution * 1000)
+        self._starts = np.zeros(2 * capacity, dtype=np.int64)
+        self._mins = np.zeros(2 * capacity, dtype=np.float32)
+        self._maxs = np.zeros(2 * capacity, dtype=np.float32)
+        self._sums = np.zeros(2 * capacity, dtype=np.float64)
+        self._counts = np.zeros(2 * capacity, dtype=np.int64)
+        self._bucket = None  # number of the current bucket (t // resolution)
+        self._head = 0  # next bucket slot, in [0, capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, t, value):
+        """Fold one sample (t in ms) into its bucket"""
+        b = t // self._res_ms
+        if self._bucket is None or b > self._bucket:
+            i = self._head
+            self._bucket = b
+            self._head = (i + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+            for j in (i, i + self.capacity):
+                self._starts[j] = b * self._res_ms
+                self._mins[j] = self._maxs[j] = self._sums[j] = value
+                self._counts[j] = 1
+            return
+        i = (self._head - 1) % self.capacity
+        for j in (i, i + self.capacity):
+            if value < self._mins[j]:
+                self._mins[j] = value
+            if value > self._maxs[j]:
+                self._maxs[j] = value
+            self._sums[j] += value
+            self._counts[j] += 1
+
+    def _window(self):
+        end = self._head if self._size < self.capacity else self._head + self.capacity
+        return slice(end - self._size, end)
+
+    def times(self):
+        """Bucket start times (ms), oldest first"""
+        return self._starts[self._window()]
+
+    def values(self):
+        """Bucket means"""
+        w = self._window()
+        return (self._sums[w] / self._counts[w]).astype(np.float32)
+
+    def mins(self):
+        return self._mins[self._window()]
+
+    def maxs(self):
+        return self._maxs[self._window()]
+
+    def counts(self):
+        return self._counts[self._window()]
+
+    def last(self):
+        """(start, mean) of the current bucket, or None when empty"""
+        if not self._size:
+            return None
+        i = (self._head - 1) % self.capacity
+        return int(self._starts[i]), float(self._sums[i] / self._counts[i])
+
+
+class Rollup:
+    """One RollupSeries per (resolution, capacity) in `levels`"""
+
+    def __init__(self, levels=LEVELS):
+        self.levels = {resolution: RollupSeries(resolution, capacity) for resolution, capacity in levels}
+
+    def __len__(self):
+        return max((len(s) for s in self.levels.values()), default=0)
+
+    def append(self, t, value):
+        for series in self.levels.values():
+            series.add(t, value)
+
+    def extend(self, t, values):
+        for value in values:
+            self.append(t, value)
+
+    def level(self, resolution):
+        return self.levels[resolution]
@@ -0,0 +1,263 @@
+"""Append-only binary sample log, memory-mapped for reading
+
+A log is three files next to each other:
+
+    path         fixed-size records (RECORD) after a 16-byte header
+    path.idx     one INDEX entry per network per flushed batch
+    path.names   network names, one JSON string per line (id = line number)
+
+SampleLog buffers samples and appends them in batches sorted by network, so
+each network's samples in a batch are one contiguous run of records that a
+single index entry (start, count, first and last time) points to.
+SampleLogReader maps the record file and only touches the runs of the
+network (and time range) asked for. Files are written names -> records ->
+index; records left unindexed by a crash are indexed again on the next open.
+"""
+
+import json
+import os
+
+import numpy as np
+
+MAGIC = b'WIFILOG1'
+HEADER_SIZE = 16
+
+SCAN = 0
+CONNECTED = 1
+
+# t: ms since the epoch; bssid: 48-bit MAC (0 = unknown); signal: % (-1 = unknown);
+# channel: 0 = unknown; kind: SCAN / CONNECTED
+RECORD = np.dtype([('t', '<i8'), ('bssid', '<u8'), ('net', '<u4'),
+                   ('signal', '<i2'), ('channel', 'u1'), ('kind', 'u1')])
+
+INDEX = np.dtype([('net', '<u4'), ('count', '<u4'), ('start', '<u8'),
+                  ('t_min', '<i8'), ('t_max', '<i8')])
+
+
+def pack_bssid(bssid):
+    """'aa:bb:cc:dd:ee:ff' -> int (0 when missing or malformed)"""
+    if not bssid:
+        return 0
+    try:
+        value = int(bssid.replace(':', '').replace('-', ''), 16)
+    except ValueError:
+        return 0
+    return value if value < 1 << 48 else 0
+
+
+def _header():
+    return MAGIC + RECORD.itemsize.to_bytes(4, 'little') + bytes(HEADER_SIZE - len(MAGIC) - 4)
+
+
+def _check_header(data, path):
+    if data[:len(MAGIC)] != MAGIC or int.from_bytes(data[8:12], 'little') != RECORD.itemsize:
+        raise ValueError(f"{path} is not a sample log")
+
+
+def _read_names(path):
+    names = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.endswith('\n'):  # a torn last line was never referenced
+                    names.append(json.loads(line))
+    return names
+
+
+def _index_runs(records, base):
+    """INDEX entries for records sorted by network, starting at record number base"""
+    nets, starts, counts = np.unique(records['net'], return_index=True, return_counts=True)
+    index = np.empty(len(nets), dtype=INDEX)
+    index['net'] = nets
+    index['count'] = counts
+    index['start'] = base + starts
+    index['t_min'] = np.minimum.reduceat(records['t'], starts)
+    index['t_max'] = np.maximum.reduceat(records['t'], starts)
+    return index
+
+
+class SampleLog:
+    """Batched writer: append() buffers, flush() writes one sorted batch
+
+    A batch is written once batch_size samples are buffered; call flush()
+    (or close()) to write the rest. Larger batches mean fewer index entries
+    per network: at one sample per network per scan, the index is about
+    1/scans-per-batch the size of the records.
+    """
+
+    def __init__(self, path, batch_size=4096):
+        self.path = path
+        self.batch_size = batch_size
+        self._rows = []
+        self._names = _read_names(path + '.names')
+        self._ids = {name: i for i, name in enumerate(self._names)}
+        self._names_file = open(path + '.names', 'a', encoding='utf-8')
+        self._data = open(path, 'a+b')
+        self._index = open(path + '.idx', 'a+b')
+        self._recover()
+
+    def _recover(self):
+        """Write the header of a new log, drop torn writes and index unindexed records"""
+        size = self._data.seek(0, os.SEEK_END)
+        if size < HEADER_SIZE:
+            self._data.truncate(0)
+            self._data.write(_header())
+            self._data.flush()
+            size = HEADER_SIZE
+        self._data.seek(0)
+        _check_header(self._data.read(HEADER_SIZE), self.path)
+        n = (size - HEADER_SIZE) // RECORD.itemsize
+        self._data.truncate(HEADER_SIZE + n * RECORD.itemsize)
+
+        index_size = self._index.seek(0, os.SEEK_END)
+        self._index.truncate(index_size - index_size % INDEX.itemsize)
+        self._index.seek(0)
+        index = np.frombuffer(self._index.read(), dtype=INDEX)
+        ends = index['start'] + index['count']
+        if len(index) and ends.max() > n:  # index written past records that were lost
+            index = index[ends <= n]
+            self._index.truncate(0)
+            self._index.write(index.tobytes())
+        indexed = int(ends[ends <= n].max()) if len(index) else 0
+        if indexed < n:
+            self._data.seek(HEADER_SIZE + indexed * RECORD.itemsize)
+            tail = np.frombuffer(self._data.read(), dtype=RECORD)
+            # Tail records were written in sorted batches; split them where the network id drops
+            cuts = np.flatnonzero(np.diff(tail['net'].astype(np.int64)) < 0) + 1
+            for batch, offset in zip(np.split(tail, cuts), np.concatenate([[0], cuts])):
+                self._index.seek(0, os.SEEK_END)
+                self._index.write(_index_runs(batch, indexed + int(offset)).tobytes())
+        self._index.flush()
+        self.records = n
+
+    def intern(self, name):
+        """Id of a network name, added to the names file on first use"""
+        i = self._ids.get(name)
+        if i is None:
+            i = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._names_file.write(json.dumps(name, ensure_ascii=False) + '\n')
+        return i
+
+    def append(self, t, ssid, bssid=None, signal=None, channel=None, kind=SCAN):
+        """Buffer one sample (t in seconds since the epoch)
+
+        A signal or channel that does not fit its RECORD field is stored as
+        unknown, so one bad value never makes a whole batch unwritable.
+        """
+        if kind not in (SCAN, CONNECTED):
+            raise ValueError(f"unknown sample kind: {kind!r}")
+        signal = int(signal) if signal is not None and 0 <= signal < 1 << 15 else -1
+        channel = int(channel) if channel and 0 < channel < 1 << 8 else 0
+        self._rows.append((int(t * 1000), pack_bssid(bssid), self.intern(ssid or ''),
+                           signal, channel, kind))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def append_scan(self, t, records, interfaces=()):
+        """Buffer the BssidRecords of one scan and the connected InterfaceRecords"""
+        for r in records:
+            self.append(t, r.ssid, r.bssid, r.signal, r.channel, SCAN)
+        for i in interfaces:
+            if i.ssid:
+                self.append(t, i.ssid, i.bssid, i.signal, i.channel, CONNECTED)
+
+    def flush(self):
+        """Write the buffered samples as one batch sorted by network"""
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        batch = np.array(rows, dtype=RECORD)
+        batch = batch[np.argsort(batch['net'], kind='stable')]  # time order kept within a network
+        self._names_file.flush()
+        self._data.seek(0, os.SEEK_END)
+        self._data.write(batch.tobytes())
+        self._data.flush()
+        self._index.seek(0, os.SEEK_END)
+        self._index.write(_index_runs(batch, self.records).tobytes())
+        self._index.flush()
+        self.records += len(batch)
+
+    def close(self):
+        if self._data.closed:
+            return
+        self.flush()
+        for f in (self._names_file, self._data, self._index):
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SampleLogReader:
+    """Memory-mapped view of a sample log
+
+    load() gathers one network's runs from the index, so its cost depends
+    on that network's samples, not on the size of the log.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.names = _read_names(path + '.names')
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            _check_header(f.read(HEADER_SIZE), path)
+        n = max(0, (size - HEADER_SIZE) // RECORD.itemsize)
+        self.records = (np.memmap(path, dtype=RECORD, mode='r', offset=HEADER_SIZE, shape=(n,))
+                        if n else np.empty(0, dtype=RECORD))
+        index = np.fromfile(path + '.idx', dtype=INDEX) if os.path.exists(path + '.idx') \
+            else np.empty(0, dtype=INDEX)
+        index = index[index['start'] + index['count'] <= n]
+        # Group the index by network, keeping file (= time) order within each
+        self._index = index[np.argsort(index['net'], kind='stable')]
+        self._nets = self._index['net']
+
+    def __len__(self):
+        return len(self.records)
+
+    def networks(self):
+        """Network names that have samples"""
+        return [self.names[i] for i in np.unique(self._nets)]
+
+    def _runs(self, ssid):
+        i = self._ids.get(ssid)
+        if i is None:
+            return self._index[:0]
+        lo, hi = np.searchsorted(self._nets, [i, i + 1])
+        return self._index[lo:hi]
+
+    def load(self, ssid, start=None, end=None, kind=SCAN):
+        """Structured array (RECORD) of ssid's samples, oldest first
+
+        start / end (seconds since the epoch) bound the time range, kind
+        selects SCAN (default) or CONNECTED samples, None both.
+        """
+        runs = self._runs(ssid)
+        lo = None if start is None else int(start * 1000)
+        hi = None if end is None else int(end * 1000)
+        if lo is not None:
+            runs = runs[runs['t_max'] >= lo]
+        if hi is not None:
+            runs = runs[runs['t_min'] <= hi]
+        if not len(runs):
+            return np.empty(0, dtype=RECORD)
+        out = np.concatenate([self.records[s:s + c] for s, c in zip(runs['start'].tolist(),
+                                                                      runs['count'].tolist())])
+        mask = np.ones(len(out), dtype=bool)
+        if lo is not None:
+            mask &= out['t'] >= lo
+        if hi is not None:
+            mask &= out['t'] <= hi
+        if kind is not None:
+            mask &= out['kind'] == kind
+        return out if mask.all() else out[mask]
+
+    def series(self, ssid, start=None, end=None, kind=SCAN):
+        """(times in seconds, signals) of ssid's scan samples, samples without a signal left out"""
+        rec = self.load(ssid, start, end, kind)
+        rec = rec[rec['signal'] >= 0]
+        return rec['t'] / 1000.0, rec['signal'].astype(np.float32)
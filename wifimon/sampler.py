@@ -0,0 +1,79 @@
+"""Background sampling of the scan functions, decoupled from the plot loop"""
+
+import collections
+import threading
+import time
+
+Sample = collections.namedtuple('Sample', ['time', 'networks', 'connected_ssid', 'connected_signal'])
+
+
+class SampleBuffer:
+    """Thread-safe bounded buffer of timestamped samples"""
+
+    def __init__(self, maxlen=256):
+        self._samples = collections.deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._latest = None
+
+    def push(self, sample):
+        with self._lock:
+            self._samples.append(sample)
+            self._latest = sample
+
+    def drain(self):
+        """Return and forget every sample pushed since the last drain"""
+        with self._lock:
+            samples = list(self._samples)
+            self._samples.clear()
+        return samples
+
+    def latest(self):
+        """Most recent sample, even if already drained (None before the first one)"""
+        return self._latest
+
+
+class Sampler:
+    """Run scan() / connected() every `interval` seconds on a daemon thread
+
+    scan() returns whatever the caller's update() expects (e.g. {ssid: signal}),
+    connected() returns (ssid, signal). Slow or failing calls only delay the
+    next sample; the renderer keeps drawing what is already in the buffer.
+    """
+
+    def __init__(self, scan, connected=None, interval=5.0, buffer=None):
+        self.scan = scan
+        self.connected = connected
+        self.interval = interval
+        self.buffer = buffer if buffer is not None else SampleBuffer()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='wifi-sampler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def sample_once(self):
+        """Take one sample synchronously and push it to the buffer"""
+        now = time.time()
+        networks = self.scan()
+        ssid, signal = self.connected() if self.connected else (None, None)
+        sample = Sample(now, networks, ssid, signal)
+        self.buffer.push(sample)
+        return sample
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample_once()
+            except Exception as e:
+                print(f"Sampler error: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
@@ -0,0 +1,140 @@
+"""netsh scan helpers shared by the headless commands (no plotting imports)"""
+
+import codecs
+import functools
+import locale
+import subprocess
+import sys
+import time
+
+from wifimon.parser import parse_networks, parse_interfaces
+
+NETWORKS_COMMAND = "netsh wlan show networks mode=bssid"
+INTERFACES_COMMAND = "netsh wlan show interfaces"
+
+# The scripts' fallback chain, most detailed output first
+SCAN_COMMANDS = (
+    NETWORKS_COMMAND,
+    "netsh wlan show networks",
+    "netsh wlan show all",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def console_codec():
+    """Codec of the console code page netsh writes with, looked up once per session"""
+    if sys.platform == 'win32':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        # No console attached (pythonw, IDE): child processes use the OEM code page
+        cp = kernel32.GetConsoleOutputCP() or kernel32.GetOEMCP()
+        codec = 'utf-8' if cp == 65001 else f"cp{cp}"
+    else:
+        codec = locale.getpreferredencoding(False)
+    try:
+        return codecs.lookup(codec).name
+    except (LookupError, TypeError):
+        return 'utf-8'
+
+
+def decode_output(data):
+    """Decode raw command output (bytes) with the cached console codec"""
+    return data.decode(console_codec(), errors='replace')
+
+
+def run_command(cmd, timeout=15):
+    """Run cmd and return its decoded stdout, or '' when it fails or times out"""
+    try:
+        result = subprocess.run(cmd, shell=True, capture_output=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return ''
+    return decode_output(result.stdout) if result.returncode == 0 else ''
+
+
+def scan_networks(timeout=15, run=run_command):
+    """BssidRecord list of the currently visible networks"""
+    return parse_networks(run(NETWORKS_COMMAND, timeout))
+
+
+def scan_interfaces(timeout=10, run=run_command):
+    """InterfaceRecord list of the WLAN interfaces"""
+    return parse_interfaces(run(INTERFACES_COMMAND, timeout))
+
+
+class CommandChain:
+    """Fallback chain that remembers which (command, parser) candidate last worked
+
+    `candidates` is a list of (name, func) in priority order; func() returns
+    the parsed result, and a falsy result or an exception counts as a
+    failure. Calls go straight to the remembered candidate, so a steady
+    state costs a single spawn. The rest of the chain is only probed when
+    that candidate fails, and the higher-priority ones again every
+    `reprobe_interval` seconds. A failing candidate is skipped for an
+    exponentially growing backoff (`backoff` .. `max_backoff` seconds).
+    """
+
+    def __init__(self, candidates, reprobe_interval=300.0, backoff=10.0, max_backoff=300.0,
+                 empty=None, clock=time.monotonic):
+        self.candidates = list(candidates)
+        self.reprobe_interval = reprobe_interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.empty = empty
+        self.clock = clock
+        self._current = None
+        self._reprobe_at = 0.0
+        self._failures = [0] * len(self.candidates)
+        self._retry_at = [0.0] * len(self.candidates)
+
+    @property
+    def current(self):
+        """Name of the candidate in use, or None before the first success"""
+        return None if self._current is None else self.candidates[self._current][0]
+
+    def _attempt(self, i, now):
+        try:
+            result = self.candidates[i][1]()
+        except Exception:
+            result = None
+        if result:
+            self._failures[i] = 0
+            self._retry_at[i] = 0.0
+            return result
+        self._failures[i] += 1
+        self._retry_at[i] = now + min(self.max_backoff, self.backoff * 2 ** (self._failures[i] - 1))
+        return None
+
+    def _use(self, i, now):
+        if i != self._current:
+            self._current = i
+            self._reprobe_at = now + self.reprobe_interval
+
+    def __call__(self):
+        now = self.clock()
+        tried = set()
+        current = self._current
+        if current is not None:
+            if current > 0 and now >= self._reprobe_at:
+                # Periodically check whether a better command works again
+                self._reprobe_at = now + self.reprobe_interval
+                for i in range(current):
+                    if self._retry_at[i] <= now:
+                        tried.add(i)
+                        result = self._attempt(i, now)
+                        if result:
+                            self._use(i, now)
+                            return result
+            tried.add(current)
+            result = self._attempt(current, now)
+            if result:
+                return result
+
+        for i in range(len(self.candidates)):
+            if i in tried or self._retry_at[i] > now:
+                continue
+            result = self._attempt(i, now)
+            if result:
+                self._use(i, now)
+                return result
+        self._current = None
+        return self.empty
@@ -0,0 +1,139 @@
+"""Long-lived shell process that runs commands sent over stdin
+
+Spawning netsh (plus cmd.exe with shell=True) for every sample is often the
+slowest part of a scan. PersistentShell starts the shell once and writes
+each command followed by an echo of a unique marker and the exit status;
+stdout is read up to that marker. A shell that died or timed out is killed
+and started again on the next command.
+"""
+
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from wifimon.scan import decode_output
+
+if sys.platform == 'win32':
+    DEFAULT_SHELL = ['cmd.exe', '/Q', '/D', '/K']
+    _SCRIPT = "{cmd} <NUL\r\necho {marker} %errorlevel%\r\n"
+else:
+    DEFAULT_SHELL = ['/bin/sh']
+    _SCRIPT = "{cmd} </dev/null\necho {marker} $?\n"
+
+
+class PersistentShell:
+    """One shell process reused for every command (see run / output)"""
+
+    def __init__(self, argv=None, timeout=15.0, env=None):
+        self.argv = list(argv or DEFAULT_SHELL)
+        self.timeout = timeout
+        self.env = env
+        self.restarts = 0
+        self._proc = None
+        self._lines = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._proc = subprocess.Popen(self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL, env=self.env)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._proc.stdout, self._lines),
+                         name='wifi-shell-reader', daemon=True).start()
+
+    @staticmethod
+    def _pump(stream, lines):
+        for line in iter(stream.readline, b''):
+            lines.put(line)
+        lines.put(None)
+        stream.close()
+
+    def _stop(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc.stdin.close()
+            # stdout is closed by the reader thread: a command still running in the killed
+            # shell (a hung netsh) keeps the pipe open, and closing it here would wait for it
+            self._proc = None
+
+    def run(self, cmd, timeout=None):
+        """(exit status, decoded stdout) of cmd
+
+        Raises subprocess.TimeoutExpired (after killing the shell) when no
+        answer arrives within timeout seconds. A shell that cannot take the
+        command is restarted once before giving up with status -1; a command
+        it took is never sent again, so one that ends the shell (exit, crash)
+        gets status -1.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            for _ in range(2):
+                if self._proc is None or self._proc.poll() is not None:
+                    if self._proc is not None:
+                        self._stop()
+                        self.restarts += 1
+                    self._start()
+                self._seq += 1
+                marker = f"__wifimon_{os.getpid()}_{self._seq}__"
+                try:
+                    self._proc.stdin.write(_SCRIPT.format(cmd=cmd, marker=marker).encode())
+                    self._proc.stdin.flush()
+                except OSError:
+                    self._stop()
+                    self.restarts += 1
+                    continue
+                result = self._read_until(marker.encode(), cmd, timeout)
+                if result is None:
+                    self._stop()  # EOF: the shell exited under us
+                    self.restarts += 1
+                    return -1, ''
+                return result
+            return -1, ''
+
+    def _read_until(self, marker, cmd, timeout):
+        deadline = time.monotonic() + timeout
+        out = []
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise queue.Empty
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                self._stop()
+                self.restarts += 1
+                raise subprocess.TimeoutExpired(cmd, timeout) from None
+            if line is None:
+                return None
+            i = line.find(marker)
+            if i < 0:
+                out.append(line)
+                continue
+            out.append(line[:i])  # output that did not end with a newline
+            try:
+                status = int(line[i + len(marker):])
+            except ValueError:
+                status = -1
+            return status, decode_output(b''.join(out))
+
+    def output(self, cmd, timeout=None):
+        """stdout of cmd, or '' when it fails or times out (same contract as run_command)"""
+        try:
+            status, out = self.run(cmd, timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            return ''
+        return out if status == 0 else ''
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,115 @@
+"""O(1) sliding-window statistics for per-network signal samples"""
+
+import collections
+import math
+
+
+class SlidingStats:
+    """Mean, std, min, max and quantiles over the last `window` samples
+
+    push() is O(1): Welford updates with removal of the expired sample for
+    mean/variance, monotonic deques for min/max and a fixed histogram of
+    integer bins over [lo, hi] for quantiles (signal % are integers, so the
+    quantiles are exact there). Query cost does not depend on the window.
+    """
+
+    def __init__(self, window=100, lo=0, hi=100):
+        self.window = window
+        self.lo = lo
+        self.hi = hi
+        self._values = collections.deque()
+        self._mins = collections.deque()  # (index, value), increasing values
+        self._maxs = collections.deque()  # (index, value), decreasing values
+        self._hist = [0] * (hi - lo + 1)
+        self._count = 0  # total samples ever pushed
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self):
+        return len(self._values)
+
+    def _bin(self, value):
+        return min(max(int(round(value)), self.lo), self.hi) - self.lo
+
+    def push(self, value):
+        value = float(value)
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+
+        # Welford
+        n = len(self._values)
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+
+        i = self._count
+        self._count += 1
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((i, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((i, value))
+        first = self._count - len(self._values)
+        if self._mins[0][0] < first:
+            self._mins.popleft()
+        if self._maxs[0][0] < first:
+            self._maxs.popleft()
+
+        self._hist[self._bin(value)] += 1
+
+    def extend(self, values):
+        for value in values:
+            self.push(value)
+
+    def _remove(self, value):
+        n = len(self._values) + 1  # count before value was popped
+        if n <= 1:
+            self._mean = self._m2 = 0.0
+        else:
+            old_mean = self._mean
+            self._mean = (n * old_mean - value) / (n - 1)
+            self._m2 = max(0.0, self._m2 - (value - old_mean) * (value - self._mean))
+        self._hist[self._bin(value)] -= 1
+
+    @property
+    def mean(self):
+        return self._mean if self._values else math.nan
+
+    @property
+    def var(self):
+        """Population variance (same as np.var)"""
+        return self._m2 / len(self._values) if self._values else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.var) if self._values else math.nan
+
+    @property
+    def min(self):
+        return self._mins[0][1] if self._values else math.nan
+
+    @property
+    def max(self):
+        return self._maxs[0][1] if self._values else math.nan
+
+    @property
+    def last(self):
+        return self._values[-1] if self._values else math.nan
+
+    def quantile(self, q):
+        """Lower q-quantile (0 <= q <= 1) of the binned samples"""
+        n = len(self._values)
+        if not n:
+            return math.nan
+        rank = min(n - 1, max(0, math.ceil(q * n) - 1))
+        seen = 0
+        for i, count in enumerate(self._hist):
+            seen += count
+            if seen > rank:
+                return i + self.lo
+        return self.hi
+
+    def mean_std(self):
+        return self.mean, self.std
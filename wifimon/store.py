@@ -0,0 +1,147 @@
+"""Fixed-capacity per-network time series backed by preallocated NumPy arrays"""
+
+import collections
+import os
+
+import numpy as np
+
+# Eviction defaults for the plotting scripts (seconds unseen, networks tracked)
+NETWORK_TTL = float(os.environ.get('WIFIMON_TTL', 600))
+MAX_NETWORKS = int(os.environ.get('WIFIMON_MAX_NETWORKS', 1024))
+
+
+class RingSeries:
+    """Ring buffer of (int64 timestamp in ms, float32 signal) samples
+
+    Every sample is written twice, at i and i + capacity, so the last `len`
+    samples are always one contiguous slice: times()/values() are views,
+    never copies, and append() never allocates.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._times = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros(2 * capacity, dtype=np.float32)
+        self._head = 0  # next write position, in [0, capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, t, value):
+        i = self._head
+        j = i + self.capacity
+        self._times[i] = self._times[j] = t
+        self._values[i] = self._values[j] = value
+        self._head = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, t, values):
+        """Append several signals sharing one timestamp (e.g. one per BSSID)"""
+        for value in values:
+            self.append(t, value)
+
+    def _window(self):
+        end = self._head if self._size < self.capacity else self._head + self.capacity
+        return slice(end - self._size, end)
+
+    def times(self):
+        """Timestamps (ms), oldest first, as a read-only view"""
+        view = self._times[self._window()]
+        view.flags.writeable = False
+        return view
+
+    def values(self):
+        """Signals, oldest first, as a read-only view"""
+        view = self._values[self._window()]
+        view.flags.writeable = False
+        return view
+
+    def last(self):
+        """Most recent (timestamp, signal), or None when empty"""
+        if not self._size:
+            return None
+        i = (self._head - 1) % self.capacity
+        return int(self._times[i]), float(self._values[i])
+
+
+class SeriesStore:
+    """One RingSeries per network key, created on first append
+
+    With ttl (seconds), a network whose last sample is older than ttl
+    before the newest one appended is dropped; with max_keys, creating a
+    series beyond that count drops the least recently appended one. Keys
+    keep their first-seen order; on_evict(key) is called for each drop so
+    callers can forget what they keep per network. factory() makes the
+    per-key series (RingSeries(capacity) by default, e.g. rollup.Rollup).
+    """
+
+    def __init__(self, capacity=50, ttl=None, max_keys=None, on_evict=None, factory=None):
+        self.capacity = capacity
+        self.factory = factory or (lambda: RingSeries(self.capacity))
+        self.ttl_ms = None if not ttl else int(ttl * 1000)
+        self.max_keys = max_keys or None
+        self.on_evict = on_evict
+        self._series = {}
+        self._seen = collections.OrderedDict()  # key -> last timestamp, least recent first
+        self._evicting = self.ttl_ms is not None or self.max_keys is not None
+
+    def __len__(self):
+        return len(self._series)
+
+    def __contains__(self, key):
+        return key in self._series
+
+    def __getitem__(self, key):
+        return self._series[key]
+
+    def __iter__(self):
+        return iter(self._series)
+
+    def items(self):
+        return self._series.items()
+
+    def series(self, key):
+        """Return the series for key, creating it if needed"""
+        s = self._series.get(key)
+        if s is None:
+            if self.max_keys is not None:
+                while len(self._series) >= self.max_keys:
+                    self.discard(next(iter(self._seen)))
+            s = self._series[key] = self.factory()
+            if self._evicting:
+                self._seen[key] = None  # never appended: first to go
+                self._seen.move_to_end(key, last=False)
+        return s
+
+    def append(self, key, t, value):
+        self.series(key).append(t, value)
+        if self._evicting:
+            self._touch(key, t)
+
+    def extend(self, key, t, values):
+        self.series(key).extend(t, values)
+        if self._evicting:
+            self._touch(key, t)
+
+    def _touch(self, key, t):
+        seen = self._seen
+        seen[key] = t
+        seen.move_to_end(key)
+        if self.ttl_ms is not None:
+            # Least recently seen first, so only the expired keys are looked at
+            limit = t - self.ttl_ms
+            while seen:
+                oldest = next(iter(seen))
+                if seen[oldest] is not None and seen[oldest] >= limit:
+                    break
+                self.discard(oldest)
+
+    def discard(self, key):
+        """Forget key's series (no-op when absent)"""
+        if self._series.pop(key, None) is None:
+            return
+        self._seen.pop(key, None)
+        if self.on_evict is not None:
+            self.on_evict(key)
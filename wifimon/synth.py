@@ -0,0 +1,152 @@
+"""Synthetic netsh output for scale and locale load tests
+
+NetshGenerator keeps a population of BSSIDs (several per SSID, some hidden)
+whose signals drift randomly at every step(), and prints it the way
+`netsh wlan show networks mode=bssid` / `netsh wlan show interfaces` do,
+with English or French labels.
+"""
+
+import random
+
+from wifimon.parser import BssidRecord
+
+# Label column width used by netsh for both languages
+_WIDTH = 28
+
+LABELS = {
+    'en': {
+        'interface': 'Interface name', 'visible': 'There are {n} networks currently visible.',
+        'ssid': 'SSID', 'type': 'Network type', 'auth': 'Authentication', 'enc': 'Encryption',
+        'bssid': 'BSSID', 'signal': 'Signal', 'radio': 'Radio type', 'band': 'Band',
+        'channel': 'Channel', 'basic': 'Basic rates (Mbps)', 'other': 'Other rates (Mbps)',
+        'name': 'Name', 'state': 'State', 'connected': 'connected', 'ap_bssid': 'AP BSSID',
+        'infrastructure': 'Infrastructure', 'rssi': 'Rssi',
+        'interfaces': 'There is 1 interface on the system: ',
+    },
+    'fr': {
+        'interface': "Nom de l'interface", 'visible': 'Il existe actuellement {n} réseaux visibles.',
+        'ssid': 'Nom du réseau', 'type': 'Type de réseau', 'auth': 'Authentification',
+        'enc': 'Chiffrement', 'bssid': 'BSSID', 'signal': 'Signal', 'radio': 'Type de radio',
+        'band': 'Bande', 'channel': 'Canal', 'basic': 'Débits de base (Mbits/s)',
+        'other': 'Autres débits (Mbits/s)', 'name': 'Nom', 'state': 'État',
+        'connected': 'connecté', 'ap_bssid': 'BSSID', 'infrastructure': 'Infrastructure',
+        'rssi': 'Rssi', 'interfaces': 'Il existe 1 interface sur le système : ',
+    },
+}
+
+CHANNELS_24 = (1, 6, 11, 1, 6, 11, 2, 3, 4, 5, 7, 8, 9, 10, 12, 13)
+CHANNELS_5 = (36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112, 116, 132, 136, 149, 153, 157, 161, 165)
+RADIOS_24 = ('802.11n', '802.11ax', '802.11g')
+RADIOS_5 = ('802.11ac', '802.11ax', '802.11n')
+
+# Malformed outputs that a backtracking or quadratic parser chokes on, made of n repeats
+ADVERSARIAL = {
+    # Catastrophic for tp2.3.py's old pattern: SSID blocks whose signal has no '%' and no channel
+    'ssid_signal_no_percent': lambda n: "SSID 1 : x\n    Signal : 50\n" * n,
+    'labels_without_colon': lambda n: "SSID 1    Signal    Channel    " * n + "\n",
+    'whitespace_lines': lambda n: ("\n" + " " * 64) * n,
+    'single_long_line': lambda n: "SSID : " + "a" * (64 * n),
+    'bssid_only': lambda n: "    BSSID 1 : 00:11:22:33:44:55\n" * n,
+}
+
+
+class NetshGenerator:
+    """Population of `n_bssids` BSSIDs printed as netsh text
+
+    per_ssid BSSIDs share each SSID, a `hidden` fraction of the SSIDs is
+    blank, and every step() moves each signal by a Gaussian step of
+    `drift` percentage points (kept within 1..100). `lang` is 'en' or 'fr'.
+    """
+
+    def __init__(self, n_bssids=100, per_ssid=3, hidden=0.05, lang='en', drift=2.0, seed=0):
+        self.labels = LABELS[lang]
+        self.drift = drift
+        self._rng = random.Random(seed)
+        rng = self._rng
+        self._bssids = []  # [ssid, bssid, signal (float), channel, radio, band]
+        n_ssids = (n_bssids + per_ssid - 1) // per_ssid
+        b = 0
+        for s in range(n_ssids):
+            ssid = '' if rng.random() < hidden else f"Campus-{s:04d}"
+            for _ in range(min(per_ssid, n_bssids - b)):
+                five = rng.random() < 0.5
+                self._bssids.append([
+                    ssid, f"00:11:22:{b >> 16 & 255:02x}:{b >> 8 & 255:02x}:{b & 255:02x}",
+                    rng.uniform(10, 99),
+                    rng.choice(CHANNELS_5 if five else CHANNELS_24),
+                    rng.choice(RADIOS_5 if five else RADIOS_24),
+                    '5 GHz' if five else '2.4 GHz'])
+                b += 1
+
+    def __len__(self):
+        return len(self._bssids)
+
+    def step(self):
+        """Random-walk every signal by one drift step"""
+        gauss = self._rng.gauss
+        for rec in self._bssids:
+            rec[2] = min(100.0, max(1.0, rec[2] + gauss(0.0, self.drift)))
+        return self
+
+    def records(self):
+        """Current population as BssidRecords (what the parser should return)"""
+        return [BssidRecord(ssid, bssid, int(round(signal)), channel, radio, band)
+                for ssid, bssid, signal, channel, radio, band in self._bssids]
+
+    def _line(self, indent, label, value):
+        return f"{' ' * indent}{label:<{_WIDTH - indent - 1}} : {value}"
+
+    def networks_text(self):
+        """`netsh wlan show networks mode=bssid` output for the current signals"""
+        L = self.labels
+        groups = []
+        for rec in self._bssids:
+            # netsh lists every hidden network separately, named ones once per SSID
+            if groups and rec[0] and groups[-1][0][0] == rec[0]:
+                groups[-1].append(rec)
+            else:
+                groups.append([rec])
+        lines = ["", f"{L['interface']} : Wi-Fi", L['visible'].format(n=len(groups)), ""]
+        for n, group in enumerate(groups, 1):
+            lines += [f"{L['ssid']} {n} : {group[0][0]}",
+                      self._line(4, L['type'], L['infrastructure']),
+                      self._line(4, L['auth'], 'WPA2-Enterprise'),
+                      self._line(4, L['enc'], 'CCMP')]
+            for k, (_, bssid, signal, channel, radio, band) in enumerate(group, 1):
+                lines += [self._line(4, f"{L['bssid']} {k}", bssid),
+                          self._line(9, L['signal'], f"{int(round(signal))}%"),
+                          self._line(9, L['radio'], radio),
+                          self._line(9, L['band'], band),
+                          self._line(9, L['channel'], channel),
+                          self._line(9, L['basic'], '6 12 24'),
+                          self._line(9, L['other'], '9 18 36 48 54')]
+            lines.append("")
+        return "\r\n".join(lines) + "\r\n"
+
+    def interfaces_text(self, index=0):
+        """`netsh wlan show interfaces` output, connected to BSSID number `index`"""
+        L = self.labels
+        ssid, bssid, signal, channel, radio, band = self._bssids[index]
+        signal = int(round(signal))
+        return "\r\n".join([
+            "", L['interfaces'], "",
+            self._line(4, L['name'], 'Wi-Fi'),
+            self._line(4, L['state'], L['connected']),
+            self._line(4, 'SSID', ssid),
+            self._line(4, L['ap_bssid'], bssid),
+            self._line(4, L['band'], band),
+            self._line(4, L['channel'], channel),
+            self._line(4, L['radio'], radio),
+            self._line(4, L['signal'], f"{signal}%"),
+            self._line(4, L['rssi'], signal // 2 - 100),
+            ""]) + "\r\n"
+
+    def recording(self, steps, interval=5.0, t0=0.0):
+        """[(time, kind, text)] of `steps` drifting scans, for wifimon.replay.ReplaySource"""
+        records = []
+        for i in range(steps):
+            t = t0 + i * interval
+            records.append((t, 'networks', self.networks_text()))
+            records.append((t, 'interfaces', self.interfaces_text()))
+            self.step()
+        return records
@@ -0,0 +1,171 @@
+"""Per-stage latency histograms for the scan and update loops (off by default)
+
+    with profiler.stage('update.draw'):
+        ...
+
+    @profiler.timed('scan')
+    def scan_available_wifis(): ...
+
+When profiling is off, stage() hands back one shared no-op context manager
+and timed() wrappers only test a flag. It is switched on by the
+WIFIMON_PROFILE environment variable (or `--profile` on the CLI), and then
+prints p50/p95/p99 per stage every WIFIMON_PROFILE_EVERY seconds (default
+10) to stderr, or writes them as JSON to WIFIMON_PROFILE_FILE.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+# Buckets are 2**(1/4) wide (~19 %), from 1 us up to ~4.4 hours
+_BUCKETS_PER_OCTAVE = 4
+_N_BUCKETS = 136
+_MIN = 1e-6
+
+
+class LatencyHistogram:
+    """Log-bucketed latency counts with exact count / total / max"""
+
+    def __init__(self):
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        i = 0 if seconds <= _MIN else int(math.log2(seconds / _MIN) * _BUCKETS_PER_OCTAVE)
+        self.counts[min(i, _N_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Upper edge of the bucket holding the q-quantile (seconds)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.max, _MIN * 2 ** ((i + 1) / _BUCKETS_PER_OCTAVE))
+        return self.max
+
+    def summary(self):
+        return {'count': self.count, 'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+                'p50_ms': self.quantile(0.50) * 1000, 'p95_ms': self.quantile(0.95) * 1000,
+                'p99_ms': self.quantile(0.99) * 1000, 'max_ms': self.max * 1000}
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.started)
+
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class Profiler:
+    """Named LatencyHistograms with periodic reports"""
+
+    def __init__(self, enabled=False, report_every=10.0, output=None):
+        self.enabled = enabled
+        self.report_every = report_every
+        self.output = output
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._next_report = time.monotonic() + report_every
+        self._atexit = False
+        if enabled:
+            self._register()
+
+    def _register(self):
+        if not self._atexit:
+            atexit.register(self.report)
+            self._atexit = True
+
+    def configure(self, enabled=True, report_every=None, output=None):
+        self.enabled = enabled
+        if report_every is not None:
+            self.report_every = report_every
+        if output is not None:
+            self.output = output
+        self._next_report = time.monotonic() + self.report_every
+        if enabled:
+            self._register()
+        return self
+
+    def stage(self, name):
+        """Context manager timing its block as `name` (no-op when disabled)"""
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def timed(self, name):
+        """Decorator timing every call as `name`"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started)
+            return wrapper
+        return decorate
+
+    def record(self, name, seconds):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.record(seconds)
+
+    def tick(self):
+        """Report if report_every seconds have passed (call once per frame)"""
+        if self.enabled and time.monotonic() >= self._next_report:
+            self._next_report = time.monotonic() + self.report_every
+            self.report()
+
+    def summary(self):
+        with self._lock:
+            return {name: hist.summary() for name, hist in sorted(self.histograms.items())}
+
+    def report(self):
+        """Print the per-stage summary, or write it as JSON to `output`"""
+        summary = self.summary()
+        if not summary:
+            return
+        if self.output:
+            tmp = self.output + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'time': time.time(), 'stages': summary}, f, indent=2)
+            os.replace(tmp, self.output)
+            return
+        lines = [f"{'stage':<22}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for name, s in summary.items():
+            lines.append(f"{name:<22}{s['count']:>7}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+                         f"{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}")
+        print('\n'.join(lines), file=sys.stderr, flush=True)
+
+
+profiler = Profiler(enabled=bool(os.environ.get('WIFIMON_PROFILE')),
+                    report_every=float(os.environ.get('WIFIMON_PROFILE_EVERY', 10)),
+                    output=os.environ.get('WIFIMON_PROFILE_FILE'))
@@ -0,0 +1,68 @@
+"""Incrementally maintained ranking of networks by signal (latest or mean)
+
+TopK files every key in a bucket of `resolution` score units between lo
+and hi, so update() and discard() are O(1) and top(k) walks the buckets
+from the strongest down, sorting only the few keys it takes from them,
+instead of sorting every network on every frame.
+"""
+
+import os
+
+# Networks drawn by the dual views (the first 8 with markers, value and legend)
+TOP_NETWORKS = int(os.environ.get('WIFIMON_TOP', 32))
+
+
+class TopK:
+    """Keys ordered by their last update()d score, highest first
+
+    Scores outside [lo, hi] go to the first / last bucket (they still sort
+    correctly against the keys sharing it). Equal scores keep the order in
+    which keys reached them.
+    """
+
+    def __init__(self, lo=0.0, hi=100.0, resolution=1.0):
+        self.lo = lo
+        self.resolution = resolution
+        self._buckets = [{} for _ in range(int((hi - lo) / resolution) + 1)]  # ordered key sets
+        self._where = {}  # key -> bucket number
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, key):
+        return key in self._scores
+
+    def _bucket(self, score):
+        b = int((score - self.lo) // self.resolution)
+        return min(max(b, 0), len(self._buckets) - 1)
+
+    def update(self, key, score):
+        b = self._bucket(score)
+        old = self._where.get(key)
+        if old != b:
+            if old is not None:
+                del self._buckets[old][key]
+            self._buckets[b][key] = None
+            self._where[key] = b
+        self._scores[key] = score
+
+    def discard(self, key):
+        b = self._where.pop(key, None)
+        if b is not None:
+            del self._buckets[b][key]
+            del self._scores[key]
+
+    def score(self, key):
+        return self._scores[key]
+
+    def top(self, k):
+        """The k highest-scored keys, highest first"""
+        out = []
+        score = self._scores.__getitem__
+        for bucket in reversed(self._buckets):
+            if bucket:
+                out.extend(sorted(bucket, key=score, reverse=True) if len(bucket) > 1 else bucket)
+                if len(out) >= k:
+                    break
+        return out[:k]